@@ -0,0 +1,113 @@
+# benchmarks/bench_decoder.py
+"""Micro-benchmark dos backends de core.decoder sobre frames @ticker.
+
+Todos os caminhos fazem o mesmo trabalho: decodificar o frame e publicar o registro num
+MarketState, como no _on_message.
+
+Uso:
+    python -m benchmarks.bench_decoder                 # frames sintéticos
+    python -m benchmarks.bench_decoder frames.txt      # um frame bruto por linha
+    python -m benchmarks.bench_decoder ticks.log.gz    # gravação do core.recorder
+"""
+import json
+import random
+import sys
+import time
+
+from core.decoder import BACKENDS
+from core.market_state import MarketState
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "BNBUSDT", "SOLUSDT", "XRPUSDT", "ADAUSDT", "DOGEUSDT", "TRXUSDT"]
+
+
+def synthetic_frames(n=50_000, seed=1):
+    """Frames no formato do stream combinado da Binance (todos os campos do @ticker)."""
+    rnd = random.Random(seed)
+    frames = []
+    for i in range(n):
+        s = rnd.choice(SYMBOLS)
+        price = rnd.uniform(0.1, 100_000)
+        data = {
+            "e": "24hrTicker", "E": 1700000000000 + i, "s": s,
+            "p": f"{rnd.uniform(-50, 50):.8f}", "P": f"{rnd.uniform(-10, 10):.3f}",
+            "w": f"{price:.8f}", "x": f"{price:.8f}", "c": f"{price:.8f}", "Q": "0.01000000",
+            "b": f"{price:.8f}", "B": "1.00000000", "a": f"{price:.8f}", "A": "1.00000000",
+            "o": f"{price * 0.98:.8f}", "h": f"{price * 1.02:.8f}", "l": f"{price * 0.97:.8f}",
+            "v": f"{rnd.uniform(1e3, 1e7):.8f}", "q": f"{rnd.uniform(1e6, 1e9):.8f}",
+            "O": 1699913600000, "C": 1700000000000, "F": 1, "L": 1000, "n": 1000,
+        }
+        # compacto, como a Binance envia
+        frames.append(json.dumps({"stream": f"{s.lower()}@ticker", "data": data}, separators=(",", ":")))
+    return frames
+
+
+def load_frames(path):
+    if path.endswith(".gz"):
+        from core.recorder import read_recording
+        return [raw for _, raw in read_recording(path)]
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def _legacy(state):
+    # caminho antigo do _on_message: json.loads + float() + dict literal + update do estado
+    def handle(raw):
+        data = json.loads(raw).get("data", {})
+        price = float(data["c"])
+        state.update(data["s"], {
+            "price": price,
+            "open_price": float(data["o"]),
+            "price_change_percent": float(data["P"]),
+            "high_price": float(data["h"]),
+            "low_price": float(data["l"]),
+            "volume": float(data["v"]),
+            "last_price": price,
+        })
+    return handle
+
+
+def _decoded(decode, state):
+    # caminho atual: registro decodificado direto e publicado
+    publish = state.publish
+
+    def handle(raw):
+        record = decode(raw)
+        if record is not None:
+            publish(record)
+    return handle
+
+
+def bench(make_handler, frames, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        handle = make_handler(MarketState())
+        t0 = time.perf_counter()
+        for raw in frames:
+            handle(raw)
+        best = min(best, time.perf_counter() - t0)
+    return len(frames) / best
+
+
+def run(frames):
+    results = {"legacy": bench(_legacy, frames)}
+    for name, decode in BACKENDS.items():
+        results[name] = bench(lambda state, decode=decode: _decoded(decode, state), frames)
+    return results
+
+
+def collect(frames):
+    # formato da suíte (benchmarks.run)
+    return {f"decode_{name}": {"value": rate, "unit": "frames/s"} for name, rate in run(frames).items()}
+
+
+def main(argv):
+    frames = load_frames(argv[0]) if argv else synthetic_frames()
+    results = run(frames)
+    base = results["legacy"]
+    print(f"{len(frames)} frames")
+    for name, rate in results.items():
+        print(f"  {name:<8} {rate:>12,.0f} frames/s  ({rate / base:.2f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
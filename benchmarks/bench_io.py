@@ -0,0 +1,117 @@
+# benchmarks/bench_io.py
+"""I/O com arquivos crescendo: histórico de preços, diário de alertas e banco de séries.
+
+Cada métrica é medida no início (arquivos vazios) e depois que os arquivos cresceram, para
+mostrar se o custo por chamada depende do tamanho do que já está em disco.
+
+Uso:
+    python -m benchmarks.bench_io
+"""
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_pipeline import market_state
+
+SNAPSHOT_SYMBOLS = 100
+SNAPSHOT_CALLS = 200        # chamadas medidas em cada fase
+SNAPSHOT_GROWTH = 2_000     # chamadas entre a fase inicial e a final
+JOURNAL_CALLS = 5_000
+JOURNAL_GROWTH = 40_000     # ~4 MB de diário, perto da rotação
+TSDB_SYMBOLS = 100
+TSDB_DAYS = 2
+TSDB_STEP = 60              # segundos entre ticks sintéticos por símbolo
+TSDB_RANGES = (("1h", 3600), ("24h", 86400), ("7d", 7 * 86400))
+
+
+def _mean_call(fn, calls):
+    t0 = time.perf_counter()
+    for i in range(calls):
+        fn(i)
+    return (time.perf_counter() - t0) / calls
+
+
+def bench_price_snapshot(scratch):
+    from core.alerts import AlertManager
+
+    manager = AlertManager(resources_dir=scratch)
+    state = market_state(SNAPSHOT_SYMBOLS)
+    save = manager._save_price_snapshot
+
+    start = _mean_call(lambda i: save(state), SNAPSHOT_CALLS)
+    for _ in range(SNAPSHOT_GROWTH):
+        save(state)
+    grown = _mean_call(lambda i: save(state), SNAPSHOT_CALLS)
+    manager.close()
+    return {
+        "price_snapshot_start": {"value": start * 1000, "unit": "ms"},
+        "price_snapshot_grown": {"value": grown * 1000, "unit": "ms"},
+    }
+
+
+def bench_alert_log(scratch):
+    from core.alerts import AlertManager
+
+    manager = AlertManager(resources_dir=scratch)
+    journal = manager.journal
+
+    def log(i):
+        manager._log_alert_trigger("BTCUSDT", "Preço Acima de", 50_000.0, 50_000.0 + i)
+        if i % journal.batch_size == 0:
+            journal.flush()
+
+    start = _mean_call(log, JOURNAL_CALLS)
+    for i in range(JOURNAL_GROWTH):
+        log(i)
+    grown = _mean_call(log, JOURNAL_CALLS)
+    manager.close()
+    return {
+        "alert_log_start": {"value": start * 1e6, "unit": "us"},
+        "alert_log_grown": {"value": grown * 1e6, "unit": "us"},
+    }
+
+
+def bench_tsdb(scratch):
+    from core.tsdb import TimeSeriesStore
+
+    store = TimeSeriesStore(os.path.join(scratch, "timeseries.db"))
+    symbols = [f"S{i}USDT" for i in range(TSDB_SYMBOLS)]
+    start = time.time() - TSDB_DAYS * 86400
+    ticks = 0
+    t0 = time.perf_counter()
+    for k in range(0, TSDB_DAYS * 86400, TSDB_STEP):
+        for i, symbol in enumerate(symbols):
+            store.add(symbol, 100.0 + (k + i) % 97, 1.0, ts=start + k)
+        ticks += len(symbols)
+    store.flush()
+    results = {"tsdb_ingest": {"value": ticks / (time.perf_counter() - t0), "unit": "ticks/s"}}
+
+    for name, span in TSDB_RANGES:
+        now = time.time()
+        elapsed = _mean_call(lambda i: store.query(symbols[i % len(symbols)], now - span, now), 50)
+        results[f"tsdb_query_{name}"] = {"value": elapsed * 1000, "unit": "ms"}
+    store.close()
+    return results
+
+
+def collect(scratch=None):
+    own = scratch is None
+    scratch = scratch or tempfile.mkdtemp(prefix="bench-")
+    try:
+        results = bench_price_snapshot(tempfile.mkdtemp(dir=scratch))
+        results.update(bench_alert_log(tempfile.mkdtemp(dir=scratch)))
+        results.update(bench_tsdb(tempfile.mkdtemp(dir=scratch)))
+        return results
+    finally:
+        if own:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    for name, r in collect().items():
+        print(f"  {name:<28} {r['value']:>14,.3f} {r['unit']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+# benchmarks/bench_pipeline.py
+"""Caminho quente do tick: MarketFeed._on_message e AlertManager.check_alerts.
+
+Uso:
+    python -m benchmarks.bench_pipeline [frames.txt | ticks.log.gz]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.bench_decoder import synthetic_frames, load_frames
+from core.market_state import MarketRecord
+
+ALERT_COUNTS = (10, 1_000, 100_000)
+ALERT_SYMBOLS = 100
+
+
+def market_state(n, seed=1):
+    """{symbol: MarketRecord} sintético com `n` símbolos."""
+    rnd = random.Random(seed)
+    state = {}
+    for i in range(n):
+        price = rnd.uniform(0.1, 50_000)
+        state[f"SYM{i:03d}USDT"] = MarketRecord(
+            f"SYM{i:03d}USDT", price, price * 0.98, rnd.uniform(-2, 2),
+            price * 1.02, price * 0.97, rnd.uniform(1e3, 1e7),
+        )
+    return state
+
+
+def _best(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+# ----------------------------------------------------
+# _on_message
+# ----------------------------------------------------
+
+def bench_on_message(frames, scratch):
+    from core.feed import MarketFeed, ENGINE_ASYNC
+    from core.alerts import AlertManager
+
+    results = {}
+
+    # motor async só para não criar o cliente REST; run() nunca é chamado (sem rede)
+    # snapshot fora e banco de séries no diretório temporário: nada de resources/ é lido ou gravado
+    feed = MarketFeed(engine=ENGINE_ASYNC, snapshot_file=None,
+                      tsdb_file=os.path.join(scratch, "timeseries.db"))
+    feed.open_tsdb()   # normalmente aberto por run(), em segundo plano
+    on_message = feed._on_message
+    elapsed = _best(lambda: [on_message(None, raw) for raw in frames])
+    results["on_message"] = {"value": len(frames) / elapsed, "unit": "frames/s"}
+
+    manager = AlertManager(resources_dir=scratch)
+    manager.add_listener(lambda kind, title, msg: None)
+    manager.attach_indicators(feed.indicators)
+    feed.add_tick_handler(manager.process_tick)
+    elapsed = _best(lambda: [on_message(None, raw) for raw in frames])
+    results["on_message_with_alerts"] = {"value": len(frames) / elapsed, "unit": "frames/s"}
+    manager.close()
+    feed.stop()
+    return results
+
+
+# ----------------------------------------------------
+# check_alerts
+# ----------------------------------------------------
+
+def far_alerts(state, n, seed=2):
+    """Alertas que nunca disparam (limiares longe do preço): mede o custo em regime."""
+    rnd = random.Random(seed)
+    symbols = list(state)
+    alerts = []
+    for i in range(n):
+        symbol = rnd.choice(symbols)
+        price = state[symbol].price
+        if i % 2:
+            alerts.append({"symbol": symbol, "condition": "Preço Acima de", "value": price * rnd.uniform(10, 20)})
+        else:
+            alerts.append({"symbol": symbol, "condition": "Preço Abaixo de", "value": price * rnd.uniform(0.01, 0.1)})
+    return alerts
+
+
+def bench_check_alerts(scratch, counts=ALERT_COUNTS):
+    from core.alerts import AlertManager
+
+    state = market_state(ALERT_SYMBOLS)
+    results = {}
+    for n in counts:
+        manager = AlertManager(resources_dir=tempfile.mkdtemp(dir=scratch))
+        manager.add_listener(lambda kind, title, msg: None)
+        manager.active_alerts = far_alerts(state, n)
+        manager.engine.load(manager.active_alerts)
+
+        manager.check_alerts(state)   # primeira passada abre os arquivos de histórico
+        elapsed = _best(lambda: manager.check_alerts(state), repeat=5)
+        results[f"check_alerts_{n}"] = {"value": elapsed * 1000, "unit": "ms"}
+        manager.close()
+    return results
+
+
+def collect(frames, scratch=None):
+    own = scratch is None
+    scratch = scratch or tempfile.mkdtemp(prefix="bench-")
+    try:
+        results = bench_on_message(frames, scratch)
+        results.update(bench_check_alerts(scratch))
+        return results
+    finally:
+        if own:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main(argv):
+    frames = load_frames(argv[0]) if argv else synthetic_frames()
+    for name, r in collect(frames).items():
+        print(f"  {name:<28} {r['value']:>14,.3f} {r['unit']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
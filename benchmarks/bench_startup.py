@@ -0,0 +1,93 @@
+# benchmarks/bench_startup.py
+"""Orçamento de partida a frio: tempo de import num interpretador novo e módulos pesados carregados.
+
+Uso:
+    python -m benchmarks.bench_startup            # mostra os tempos
+    python -m benchmarks.bench_startup --check    # sai com erro se estourar o orçamento
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# módulos que não devem ser importados antes do primeiro uso
+HEAVY_MODULES = ("pyqtgraph", "matplotlib", "binance")
+
+# orçamento em ms (melhor de REPEAT interpretadores novos)
+STARTUP_BUDGET = {
+    "import_main_window": 1500.0,
+    "import_headless": 600.0,
+}
+REPEAT = 3
+
+# medição -> módulo importado
+STARTUP_MODULES = {
+    "import_main_window": "ui.main_window",
+    "import_headless": "core.headless",
+}
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = (time.perf_counter() - t0) * 1000
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"ms": elapsed, "heavy": heavy}}))
+"""
+
+
+def probe(module, repeat=REPEAT):
+    """Importa `module` em interpretadores novos; retorna (melhor tempo em ms, módulos pesados)."""
+    best, heavy = float("inf"), []
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = min(best, result["ms"])
+        heavy = result["heavy"]
+    return best, heavy
+
+
+def collect():
+    results = {}
+    for name, module in STARTUP_MODULES.items():
+        try:
+            ms, heavy = probe(module)
+        except subprocess.CalledProcessError as e:
+            print(f"  {name} ignorado: {e.stderr.strip().splitlines()[-1]}", file=sys.stderr)
+            continue
+        results[name] = {"value": ms, "unit": "ms"}
+        results[f"{name}_heavy_modules"] = {"value": len(heavy), "unit": "modules"}
+    return results
+
+
+def over_budget(results):
+    problems = []
+    for name, budget in STARTUP_BUDGET.items():
+        r = results.get(name)
+        if r and r["value"] > budget:
+            problems.append(f"{name}: {r['value']:.0f} ms > {budget:.0f} ms")
+        heavy = results.get(f"{name}_heavy_modules")
+        if heavy and heavy["value"]:
+            problems.append(f"{name}: {heavy['value']:.0f} módulo(s) pesado(s) importado(s) na partida")
+    return problems
+
+
+def main(argv):
+    results = collect()
+    for name, r in results.items():
+        print(f"  {name:<34} {r['value']:>10,.1f} {r['unit']}")
+    problems = over_budget(results)
+    for p in problems:
+        print("  ORÇAMENTO:", p)
+    if "--check" in argv and problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,90 @@
+# benchmarks/bench_table.py
+"""Tempo de quadro do CryptoMonitorApp.update_table em Qt offscreen.
+
+A janela principal é montada de verdade (modelo, proxy de filtro, tabela, tooltips, status);
+só o worker é trocado por um sem rede, e os deltas são entregues direto ao update_table.
+
+Uso:
+    python -m benchmarks.bench_table
+"""
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.bench_pipeline import market_state
+from core.market_state import MarketRecord
+
+TABLE_SIZES = (16, 100, 500)
+FRAMES = 200
+
+
+def _moved(state, rnd):
+    # todos os símbolos mudam a cada quadro: pior caso do delta emitido pelo worker
+    delta = {}
+    for symbol, rec in state.items():
+        price = rec.price * (1 + rnd.uniform(-0.001, 0.001))
+        delta[symbol] = MarketRecord(
+            symbol, price, rec.open_price, (price / rec.open_price - 1) * 100,
+            max(rec.high_price, price), min(rec.low_price, price), rec.volume + rnd.uniform(0, 10),
+        )
+    return delta
+
+
+def _offline_worker():
+    from core.feed import MarketFeed
+    from core.worker import BinanceWorker
+
+    class OfflineWorker(BinanceWorker):
+        # run() não abre websocket nem REST; os dados chegam pelo benchmark
+        def run(self):
+            pass
+
+    return OfflineWorker(feed=MarketFeed(snapshot_file=None, tsdb_file=None))
+
+
+def collect(sizes=TABLE_SIZES, frames=FRAMES):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication
+    from core.alerts import AlertManager
+    from ui.main_window import CryptoMonitorApp
+
+    app = QApplication.instance() or QApplication([])
+    results = {}
+    for n in sizes:
+        scratch = tempfile.mkdtemp(prefix="bench-table-")
+        window = CryptoMonitorApp(worker=_offline_worker(),
+                                  alert_manager=AlertManager(resources_dir=scratch))
+        window.resize(1200, 700)
+        window.show()
+
+        state = market_state(n)
+        window.update_table(state)
+        window.update_connection_status()
+        app.processEvents()
+
+        rnd = random.Random(n)
+        deltas = [_moved(state, rnd) for _ in range(frames)]
+        t0 = time.perf_counter()
+        for delta in deltas:
+            window.update_table(delta)
+            window.table.viewport().repaint()
+            app.processEvents()
+        elapsed = time.perf_counter() - t0
+
+        results[f"update_table_{n}"] = {"value": elapsed / frames * 1000, "unit": "ms"}
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+        shutil.rmtree(scratch, ignore_errors=True)
+    return results
+
+
+def main():
+    for name, r in collect().items():
+        print(f"  {name:<28} {r['value']:>14,.3f} {r['unit']}")
+
+
+if __name__ == "__main__":
+    main()
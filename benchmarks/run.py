@@ -0,0 +1,139 @@
+# benchmarks/run.py
+"""Suíte completa: decoder, _on_message, check_alerts, I/O, update_table e partida a frio.
+
+Os resultados saem em JSON ({"meta": ..., "results": {nome: {"value", "unit"}}}) e podem ser
+comparados com uma linha de base salva de uma versão anterior.
+
+Uso:
+    python -m benchmarks.run                              # roda tudo e compara com a base, se existir
+    python -m benchmarks.run --frames ticks.log.gz        # frames gravados pelo core.recorder
+    python -m benchmarks.run --save-baseline              # grava os resultados como nova base
+    python -m benchmarks.run --only pipeline io --output out.json --fail-on-regression
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+TOLERANCE = 0.10   # variação aceita antes de marcar regressão (10%)
+
+SUITES = ("decoder", "pipeline", "io", "table", "startup")
+
+
+def higher_is_better(unit):
+    return unit.endswith("/s")
+
+
+def run_suites(names, frames, scratch):
+    from benchmarks import bench_decoder, bench_pipeline, bench_io
+
+    results = {}
+    for name in names:
+        print(f"[{name}]", file=sys.stderr)
+        try:
+            if name == "decoder":
+                results.update(bench_decoder.collect(frames))
+            elif name == "pipeline":
+                results.update(bench_pipeline.collect(frames, tempfile.mkdtemp(dir=scratch)))
+            elif name == "io":
+                results.update(bench_io.collect(tempfile.mkdtemp(dir=scratch)))
+            elif name == "table":
+                from benchmarks import bench_table
+                results.update(bench_table.collect())
+            elif name == "startup":
+                from benchmarks import bench_startup
+                startup = bench_startup.collect()
+                results.update(startup)
+                for problem in bench_startup.over_budget(startup):
+                    print("  ORÇAMENTO:", problem, file=sys.stderr)
+        except ImportError as e:
+            # ex: PyQt6 ausente numa máquina de CI só com o núcleo
+            print(f"  {name} ignorado: {e}", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Lista de (nome, base, atual, variação relativa, regressão?) para métricas em comum."""
+    rows = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base or base["unit"] != current["unit"] or not base["value"]:
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        worse = -change if higher_is_better(current["unit"]) else change
+        rows.append((name, base["value"], current["value"], change, worse > tolerance))
+    return rows
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("results", {})
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", help="frames brutos (.txt, um por linha) ou gravação .log.gz")
+    parser.add_argument("--only", nargs="+", choices=SUITES, default=list(SUITES))
+    parser.add_argument("--output", help="grava o JSON dos resultados neste arquivo")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    from benchmarks.bench_decoder import synthetic_frames, load_frames
+    frames = load_frames(args.frames) if args.frames else synthetic_frames()
+
+    scratch = tempfile.mkdtemp(prefix="bench-")
+    try:
+        results = run_suites(args.only, frames, scratch)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "frames": len(frames),
+            "frames_source": args.frames or "synthetic",
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+
+    regressions = []
+    baseline = load_baseline(args.baseline)
+    if baseline:
+        print(f"\nComparação com {args.baseline}:", file=sys.stderr)
+        for name, base, current, change, regressed in compare(results, baseline, args.tolerance):
+            flag = "  REGRESSÃO" if regressed else ""
+            print(f"  {name:<28} {base:>14,.3f} -> {current:>14,.3f}  ({change:+.1%}){flag}", file=sys.stderr)
+            if regressed:
+                regressions.append(name)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"\nLinha de base salva em {args.baseline}", file=sys.stderr)
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
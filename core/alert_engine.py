@@ -0,0 +1,420 @@
+# core/alert_engine.py
+
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+
+FIELD_PRICE = "price"
+FIELD_PERCENT = "price_change_percent"
+
+# condições sobre indicadores derivados (core/indicators.py): prefixo -> campo
+INDICATOR_CONDITIONS = {
+    "RSI": "rsi",
+    "Volatilidade": "volatility",
+    "SMA": "sma",
+    "EMA": "ema",
+    "VWAP": "vwap",
+}
+
+# condições com janela/estado próprio; o campo vira "tipo:parâmetro" (ex: "move:300")
+COND_WINDOW_MOVE = "Variação % em Janela"      # variação % nos últimos `window` segundos
+COND_MA_CROSS = "Cruza"                        # "Cruza Acima/Abaixo da Média Móvel"
+COND_VOLUME_SPIKE = "Pico de Volume"           # volume do tick / média da janela
+COND_SPREAD = "Spread %"                       # (preço / preço de symbol2 - 1) * 100
+
+DEFAULT_WINDOW = 300    # segundos
+DEFAULT_MA = "sma"
+MIN_VOLUME_SAMPLES = 5
+
+ABOVE = "above"
+BELOW = "below"
+
+
+class AlertRule:
+    """Alerta já compilado: campo, direção e valor resolvidos uma única vez."""
+
+    __slots__ = ("symbol", "field", "direction", "value", "alert", "current")
+
+    def __init__(self, symbol, field, direction, value, alert):
+        self.symbol = symbol
+        self.field = field
+        self.direction = direction
+        self.value = value
+        self.alert = alert      # dict original (o que vai para alerts.json)
+        self.current = None     # valor que disparou a regra
+
+    def __repr__(self):
+        return f"AlertRule({self.symbol}, {self.field}, {self.direction}, {self.value})"
+
+
+def _window(alert):
+    try:
+        return max(1, int(alert.get("window", DEFAULT_WINDOW)))
+    except (TypeError, ValueError):
+        return DEFAULT_WINDOW
+
+
+def compile_alert(alert):
+    """Converte o dict salvo em alerts.json numa AlertRule, ou None se for inválido."""
+    symbol = alert.get("symbol")
+    cond = alert.get("condition", "")
+    try:
+        value = float(alert.get("value"))
+    except (TypeError, ValueError):
+        return None
+    if not symbol:
+        return None
+
+    if "Acima" in cond:
+        direction = ABOVE
+    elif "Abaixo" in cond:
+        direction = BELOW
+    else:
+        return None
+
+    if cond.startswith(COND_WINDOW_MOVE):
+        field = f"move:{_window(alert)}"
+    elif cond.startswith(COND_MA_CROSS):
+        ma = alert.get("ma", DEFAULT_MA)
+        if ma not in ("sma", "ema"):
+            return None
+        field = f"ma_gap:{ma}"
+    elif cond.startswith(COND_VOLUME_SPIKE):
+        field = f"volume_spike:{_window(alert)}"
+    elif cond.startswith(COND_SPREAD):
+        other = alert.get("symbol2")
+        if not other or other == symbol:
+            return None
+        field = f"spread:{other}"
+    else:
+        field = next((f for prefix, f in INDICATOR_CONDITIONS.items() if cond.startswith(prefix)), None)
+        if field is None:
+            field = FIELD_PRICE if "Preço" in cond else FIELD_PERCENT
+
+    return AlertRule(symbol, field, direction, value, alert)
+
+
+# ----------------------------------------------------
+# Trackers — um por (símbolo, campo), compartilhado por todos os alertas desse campo
+# ----------------------------------------------------
+
+class _WindowMove:
+    """Variação % em relação ao preço de `window` segundos atrás (deque por tempo)."""
+
+    __slots__ = ("window", "samples")
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = deque()   # (t, preço)
+
+    def update(self, now, metrics, derived, prices):
+        price = metrics.get(FIELD_PRICE)
+        if not price:
+            return None
+        samples = self.samples
+        samples.append((now, price))
+        # mantém só uma amostra anterior ao início da janela: ela é a referência
+        limit = now - self.window
+        while len(samples) > 1 and samples[1][0] <= limit:
+            samples.popleft()
+        ref = samples[0][1]
+        return (price / ref - 1.0) * 100 if ref else None
+
+
+class _MaGap:
+    """Distância % do preço à média móvel do IndicatorEngine (SMA ou EMA).
+
+    Os alertas deste campo disparam por cruzamento: só quando o valor passa pelo limiar.
+    """
+
+    __slots__ = ("ma", "previous")
+
+    def __init__(self, ma):
+        self.ma = ma
+        self.previous = None
+
+    def update(self, now, metrics, derived, prices):
+        if derived is None:
+            return None
+        ma = derived.get(self.ma)
+        price = metrics.get(FIELD_PRICE)
+        if not ma or price is None:
+            return None
+        return (price / ma - 1.0) * 100
+
+
+class _VolumeSpike:
+    """Volume do tick (delta do volume 24h) dividido pela média dos ticks da janela."""
+
+    __slots__ = ("window", "samples", "total", "last_volume")
+
+    def __init__(self, window):
+        self.window = window
+        self.samples = deque()   # (t, volume do tick)
+        self.total = 0.0
+        self.last_volume = None
+
+    def update(self, now, metrics, derived, prices):
+        volume = metrics.get("volume")
+        if volume is None:
+            return None
+        last, self.last_volume = self.last_volume, volume
+        if last is None:
+            return None
+        dv = max(volume - last, 0.0)
+
+        samples = self.samples
+        limit = now - self.window
+        while samples and samples[0][0] <= limit:
+            self.total -= samples.popleft()[1]
+
+        ratio = None
+        if len(samples) >= MIN_VOLUME_SAMPLES and self.total > 0:
+            ratio = dv / (self.total / len(samples))
+
+        samples.append((now, dv))
+        self.total += dv
+        return ratio
+
+
+class _Spread:
+    """Diferença % entre o preço do símbolo e o de outro símbolo."""
+
+    __slots__ = ("other",)
+
+    def __init__(self, other):
+        self.other = other
+
+    def update(self, now, metrics, derived, prices):
+        return self.spread(metrics.get(FIELD_PRICE), prices.get(self.other))
+
+    @staticmethod
+    def spread(price, other):
+        if not other or price is None:
+            return None
+        return (price / other - 1.0) * 100
+
+
+_TRACKERS = {
+    "move": lambda arg: _WindowMove(int(arg)),
+    "ma_gap": _MaGap,
+    "volume_spike": lambda arg: _VolumeSpike(int(arg)),
+    "spread": _Spread,
+}
+
+
+def _make_tracker(field):
+    kind, sep, arg = field.partition(":")
+    if not sep:
+        return None
+    return _TRACKERS[kind](arg)
+
+
+class _ThresholdBook:
+    """Limiares de um (símbolo, campo) em listas ordenadas, separadas por direção."""
+
+    __slots__ = ("above_keys", "above_rules", "below_keys", "below_rules")
+
+    def __init__(self):
+        self.above_keys = []
+        self.above_rules = []
+        self.below_keys = []
+        self.below_rules = []
+
+    def __len__(self):
+        return len(self.above_keys) + len(self.below_keys)
+
+    def add(self, rule):
+        if rule.direction == ABOVE:
+            keys, rules = self.above_keys, self.above_rules
+        else:
+            keys, rules = self.below_keys, self.below_rules
+        i = bisect_right(keys, rule.value)
+        keys.insert(i, rule.value)
+        rules.insert(i, rule)
+
+    def remove(self, rule):
+        if rule.direction == ABOVE:
+            keys, rules = self.above_keys, self.above_rules
+        else:
+            keys, rules = self.below_keys, self.below_rules
+        lo = bisect_left(keys, rule.value)
+        hi = bisect_right(keys, rule.value)
+        for i in range(lo, hi):
+            if rules[i] is rule:
+                del keys[i]
+                del rules[i]
+                return True
+        return False
+
+    def fire(self, current):
+        # "Acima": todos os limiares < current ficam no início da lista
+        i = bisect_left(self.above_keys, current)
+        fired = self.above_rules[:i]
+        if i:
+            del self.above_keys[:i]
+            del self.above_rules[:i]
+
+        # "Abaixo": todos os limiares > current ficam no fim da lista
+        j = bisect_right(self.below_keys, current)
+        if j < len(self.below_keys):
+            fired.extend(self.below_rules[j:])
+            del self.below_keys[j:]
+            del self.below_rules[j:]
+
+        return fired
+
+    def fire_cross(self, previous, current):
+        # só os limiares atravessados entre o valor anterior e o atual
+        fired = []
+        if current > previous:
+            lo = bisect_left(self.above_keys, previous)
+            hi = bisect_left(self.above_keys, current)
+            if hi > lo:
+                fired = self.above_rules[lo:hi]
+                del self.above_keys[lo:hi]
+                del self.above_rules[lo:hi]
+        elif current < previous:
+            lo = bisect_right(self.below_keys, current)
+            hi = bisect_right(self.below_keys, previous)
+            if hi > lo:
+                fired = self.below_rules[lo:hi]
+                del self.below_keys[lo:hi]
+                del self.below_rules[lo:hi]
+        return fired
+
+
+class AlertEngine:
+    """Alertas indexados por símbolo; cada atualização custa O(log n + k) por campo.
+
+    Campos com janela (variação em N segundos, cruzamento de média, pico de volume, spread)
+    têm um tracker por (símbolo, campo) atualizado a cada tick, compartilhado por todos os
+    alertas iguais — o custo cresce com os campos distintos, não com o número de alertas.
+    """
+
+    def __init__(self):
+        self._books = {}       # symbol -> {field: _ThresholdBook}
+        self._trackers = {}    # symbol -> {field: tracker}
+        self._dependents = {}  # symbol2 -> {symbols com spread contra symbol2}
+        self._prices = {}      # último preço dos símbolos envolvidos em spreads
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def symbols(self):
+        return list(self._books)
+
+    def add(self, alert):
+        rule = compile_alert(alert)
+        if rule is None:
+            return None
+        books = self._books.setdefault(rule.symbol, {})
+        book = books.get(rule.field)
+        if book is None:
+            book = books[rule.field] = _ThresholdBook()
+            tracker = _make_tracker(rule.field)
+            if tracker is not None:
+                self._trackers.setdefault(rule.symbol, {})[rule.field] = tracker
+                if isinstance(tracker, _Spread):
+                    self._dependents.setdefault(tracker.other, set()).add(rule.symbol)
+        book.add(rule)
+        self._count += 1
+        return rule
+
+    def load(self, alerts):
+        self.clear()
+        for alert in alerts:
+            self.add(alert)
+
+    def remove(self, rule):
+        books = self._books.get(rule.symbol)
+        book = books.get(rule.field) if books else None
+        if book is None or not book.remove(rule):
+            return False
+        self._count -= 1
+        self._drop_empty(rule.symbol, rule.field)
+        return True
+
+    def clear(self):
+        self._books.clear()
+        self._trackers.clear()
+        self._dependents.clear()
+        self._prices.clear()
+        self._count = 0
+
+    def evaluate(self, symbol, metrics, derived=None, now=None):
+        """Retorna (e remove) as regras cruzadas pelos valores atuais.
+
+        `derived` (ex: Indicators do símbolo) é consultado para campos que o ticker não tem.
+        Um tick de `symbol` também reavalia os spreads de outros símbolos contra ele.
+        """
+        books = self._books.get(symbol)
+        deps = self._dependents.get(symbol)
+        if not books and not deps:
+            return []
+
+        now = time.time() if now is None else now
+        if self._dependents:
+            price = metrics.get(FIELD_PRICE)
+            if price is not None:
+                self._prices[symbol] = price
+
+        fired = []
+        if books:
+            trackers = self._trackers.get(symbol, {})
+            for field, book in list(books.items()):
+                tracker = trackers.get(field)
+                if tracker is not None:
+                    current = tracker.update(now, metrics, derived, self._prices)
+                else:
+                    current = metrics.get(field)
+                    if current is None and derived is not None:
+                        current = derived.get(field)
+                self._fire(symbol, field, book, tracker, current, fired)
+
+        # spreads de outros símbolos que usam este como referência
+        if deps:
+            field = f"spread:{symbol}"
+            for dependent in list(deps):
+                book = self._books.get(dependent, {}).get(field)
+                tracker = self._trackers.get(dependent, {}).get(field)
+                if book is None or tracker is None:
+                    continue
+                current = tracker.spread(self._prices.get(dependent), self._prices.get(symbol))
+                self._fire(dependent, field, book, tracker, current, fired)
+
+        return fired
+
+    def _fire(self, symbol, field, book, tracker, current, fired):
+        if current is None:
+            return
+        if isinstance(tracker, _MaGap):
+            # cruzamento: precisa do valor anterior para saber de que lado estava
+            previous, tracker.previous = tracker.previous, current
+            hit = book.fire_cross(previous, current) if previous is not None else []
+        else:
+            hit = book.fire(current)
+        if hit:
+            for rule in hit:
+                rule.current = current
+            fired.extend(hit)
+            self._count -= len(hit)
+            self._drop_empty(symbol, field)
+
+    def _drop_empty(self, symbol, field):
+        books = self._books.get(symbol)
+        if books and not books[field]:
+            del books[field]
+            trackers = self._trackers.get(symbol)
+            tracker = trackers.pop(field, None) if trackers else None
+            if trackers is not None and not trackers:
+                del self._trackers[symbol]
+            if isinstance(tracker, _Spread):
+                deps = self._dependents.get(tracker.other)
+                if deps is not None:
+                    deps.discard(symbol)
+                    if not deps:
+                        del self._dependents[tracker.other]
+            if not books:
+                del self._books[symbol]
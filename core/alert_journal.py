@@ -0,0 +1,155 @@
+# core/alert_journal.py
+
+import json
+import os
+import threading
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+JOURNAL_FILE = os.path.join(RESOURCES_DIR, "alerts_history.jsonl")
+LEGACY_HISTORY_FILE = os.path.join(RESOURCES_DIR, "alerts_history.json")
+
+BATCH_SIZE = 64               # força o flush quando o buffer atinge esse tamanho
+FLUSH_INTERVAL = 1.0          # segundos entre flushes do escritor em segundo plano
+MAX_BYTES = 5 * 1024 * 1024   # rotaciona o arquivo acima desse tamanho
+BACKUP_COUNT = 3
+
+
+class AlertJournal:
+    """Diário de disparos em JSON Lines, com escrita em lote numa thread de fundo."""
+
+    def __init__(self, path=JOURNAL_FILE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT, legacy_file=LEGACY_HISTORY_FILE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self._buffer = []
+        self._lock = threading.Lock()        # protege o buffer
+        self._write_lock = threading.Lock()  # serializa escrita/rotação
+        self._wake = threading.Event()
+        self._running = True
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if legacy_file and not os.path.exists(path):
+            self._import_legacy(legacy_file)
+
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._thread.start()
+
+    # ----------------------------------------------------
+    # Escrita
+    # ----------------------------------------------------
+
+    def append(self, entry):
+        with self._lock:
+            self._buffer.append(entry)
+            running = self._running
+            full = len(self._buffer) >= self.batch_size
+        if not running:
+            # fechado: sem escritor em segundo plano, grava já (ex: disparo durante o encerramento)
+            self.flush()
+        elif full:
+            self._wake.set()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                batch, self._buffer = self._buffer, []
+            if not batch:
+                return
+
+            lines = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in batch)
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    size = f.tell()
+                if size > self.max_bytes:
+                    self._rotate()
+            except OSError as e:
+                print("Erro ao salvar histórico de alertas:", e)
+
+    def _writer_loop(self):
+        while self._running:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _rotate(self):
+        # alerts_history.jsonl -> .1 -> .2 ... (o mais antigo é descartado)
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+    def close(self):
+        # sob o lock: o que entrou antes vai no último flush, o que vier depois grava direto
+        with self._lock:
+            self._running = False
+        self._wake.set()
+        self._thread.join(timeout=2)
+        self.flush()
+
+    # ----------------------------------------------------
+    # Leitura
+    # ----------------------------------------------------
+
+    def entries(self, symbol=None, condition=None, limit=None):
+        """Lista os disparos (mais antigos primeiro), opcionalmente filtrados."""
+        result = []
+        with self._write_lock:
+            for path in self._files():
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        for line in f:
+                            self._collect(result, line, symbol, condition)
+                except OSError:
+                    continue
+            with self._lock:
+                pending = list(self._buffer)
+        for entry in pending:
+            if self._matches(entry, symbol, condition):
+                result.append(entry)
+
+        if limit is not None:
+            return result[-limit:]
+        return result
+
+    def _files(self):
+        backups = [f"{self.path}.{i}" for i in range(self.backup_count, 0, -1)]
+        return [p for p in backups + [self.path] if os.path.exists(p)]
+
+    def _collect(self, result, line, symbol, condition):
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            return
+        if self._matches(entry, symbol, condition):
+            result.append(entry)
+
+    @staticmethod
+    def _matches(entry, symbol, condition):
+        if symbol and entry.get("symbol") != symbol:
+            return False
+        if condition and entry.get("condition") != condition:
+            return False
+        return True
+
+    def _import_legacy(self, legacy_file):
+        # converte o antigo alerts_history.json (lista única) para JSON Lines
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(e, ensure_ascii=False) + "\n" for e in legacy)
+        except OSError as e:
+            print("Erro ao migrar histórico de alertas:", e)
@@ -1,181 +1,214 @@
 import json
 import os
-from PyQt6.QtWidgets import QMessageBox
-from PyQt6.QtCore import QStandardPaths
+import threading
+import time
+
+from core.price_history import PriceHistoryStore, PRICE_HISTORY_DIR
+from core.alert_journal import AlertJournal, JOURNAL_FILE
+from core.auto_detect import AutoDetector
+from core.alert_engine import AlertEngine
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
 ALERT_FILE = os.path.join(RESOURCES_DIR, "alerts.json")
-HISTORY_FILE = os.path.join(RESOURCES_DIR, "alerts_history.json")
-PRICE_HISTORY_FILE = os.path.join(RESOURCES_DIR, "price_history.json")
+HISTORY_FILE = os.path.join(RESOURCES_DIR, "alerts_history.json")  # formato antigo, só para migração
+PRICE_HISTORY_FILE = os.path.join(RESOURCES_DIR, "price_history.json")  # formato antigo, só para migração
 
 # Auto-alert thresholds
 AUTO_PERCENT_THRESHOLD = 3.0  # percent change to auto-trigger
+AUTO_PERCENT_TIERS = (AUTO_PERCENT_THRESHOLD, 5.0, 10.0)  # each tier notifies once when crossed
+AUTO_HYSTERESIS = 0.5  # points below a tier needed to re-arm it
+AUTO_COOLDOWN = 300.0  # seconds before the same tier may notify again
 AUTO_ENABLE = True
 
+PRICE_SNAPSHOT_INTERVAL = 1.0  # seconds between stored prices of the same symbol
+
 def notify_user(title, message):
-    """Try to notify using plyer if available, else fallback to QMessageBox."""
+    """Try to notify using plyer if available, else fallback to a console message."""
     try:
         from plyer import notification
         notification.notify(title=title, message=message)
     except Exception:
-        # fallback will be handled by caller via QMessageBox
         print("Notification (fallback):", title, message)
 
 class AlertManager:
-    def __init__(self):
+    def __init__(self, resources_dir=RESOURCES_DIR, record_prices=True, clock=time.time):
+        # resources_dir lets benchmarks/replays run against a scratch directory
+        # record_prices=False when the feed keeps its own time-series store (core/tsdb.py)
+        # clock() is the time alerts are evaluated at; replays pass the recorded timestamps
+        self.record_prices = record_prices
+        self.clock = clock
+        self.alert_file = os.path.join(resources_dir, os.path.basename(ALERT_FILE))
         self.active_alerts = []
-        os.makedirs(RESOURCES_DIR, exist_ok=True)
+        self.engine = AlertEngine()
+        self._lock = threading.RLock()  # engine is fed from the websocket thread
+        self._listeners = []
+        self._last_snapshot = {}
+        self.indicators = None  # optional IndicatorEngine for RSI/SMA/... conditions
+        self.auto_detector = AutoDetector(AUTO_PERCENT_TIERS, AUTO_HYSTERESIS, AUTO_COOLDOWN)
+        self.resources_dir = resources_dir
+        # journal and price store (legacy migration checks, writer thread) open on first use
+        self._journal = None
+        self._price_history = None
         self.load_alerts()
-        # ensure history files exist
-        if not os.path.exists(HISTORY_FILE):
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump([], f)
-        if not os.path.exists(PRICE_HISTORY_FILE):
-            with open(PRICE_HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump({}, f)
+
+    def _local(self, path):
+        return os.path.join(self.resources_dir, os.path.basename(path))
+
+    @property
+    def journal(self):
+        if self._journal is None:
+            with self._lock:
+                if self._journal is None:
+                    self._journal = AlertJournal(self._local(JOURNAL_FILE), legacy_file=self._local(HISTORY_FILE))
+        return self._journal
+
+    @property
+    def price_history(self):
+        if self._price_history is None:
+            with self._lock:
+                if self._price_history is None:
+                    self._price_history = PriceHistoryStore(self._local(PRICE_HISTORY_DIR),
+                                                            legacy_file=self._local(PRICE_HISTORY_FILE))
+        return self._price_history
 
     def save_alerts(self):
         try:
-            with open(ALERT_FILE, "w", encoding="utf-8") as f:
+            os.makedirs(self.resources_dir, exist_ok=True)
+            with open(self.alert_file, "w", encoding="utf-8") as f:
                 json.dump(self.active_alerts, f, indent=4, ensure_ascii=False)
         except Exception as e:
             print("Erro ao salvar alerts.json:", e)
 
     def load_alerts(self):
-        if os.path.exists(ALERT_FILE):
-            try:
-                with open(ALERT_FILE, "r", encoding="utf-8") as f:
-                    self.active_alerts = json.load(f)
-            except Exception as e:
-                print("Erro ao carregar alerts.json:", e)
-                self.active_alerts = []
-        else:
+        try:
+            with open(self.alert_file, "r", encoding="utf-8") as f:
+                self.active_alerts = json.load(f)
+        except FileNotFoundError:
+            self.active_alerts = []
+        except Exception as e:
+            print("Erro ao carregar alerts.json:", e)
+            self.active_alerts = []
+        self.engine.load(self.active_alerts)
+
+    def add_alert(self, alert):
+        with self._lock:
+            self.active_alerts = self.active_alerts + [alert]
+            self.engine.add(alert)
+            self.save_alerts()
+
+    def clear_alerts(self):
+        with self._lock:
             self.active_alerts = []
+            self.engine.clear()
+            self.save_alerts()
+
+    def close(self):
+        for store in (self._journal, self._price_history):
+            if store is None:
+                continue
+            try:
+                store.close()
+            except Exception:
+                pass
 
     def _log_alert_trigger(self, symbol, condition, value, current):
-        entry = {
+        # entra no buffer do diário; o escritor em segundo plano grava em lote
+        self.journal.append({
             "symbol": symbol,
             "condition": condition,
             "value": value,
-            "current": current
-        }
-        try:
-            with open(HISTORY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            data = []
-        data.append(entry)
-        try:
-            with open(HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print("Erro ao salvar histórico de alertas:", e)
+            "current": current,
+            "time": self.clock()
+        })
 
-    def _save_price_snapshot(self, data_state):
-        # store last price per symbol to PRICE_HISTORY_FILE (keeps limited history)
-        try:
+    def trigger_history(self, symbol=None, condition=None, limit=None):
+        return self.journal.entries(symbol=symbol, condition=condition, limit=limit)
+
+    def attach_indicators(self, engine):
+        # derived values (core/indicators.py) become available to alert conditions
+        self.indicators = engine
+
+    def add_listener(self, callback):
+        # callback(kind, title, message); kind is "auto" or "alert"
+        self._listeners.append(callback)
+
+    def _notify(self, kind, title, message):
+        if not self._listeners:
             try:
-                with open(PRICE_HISTORY_FILE, "r", encoding="utf-8") as f:
-                    p = json.load(f)
+                notify_user(title, message)
             except Exception:
-                p = {}
-            for sym, metrics in data_state.items():
-                history = p.get(sym, [])
-                price = metrics.get("price")
-                if price is None:
-                    continue
-                # keep last 200 values
-                history.append(price)
-                p[sym] = history[-200:]
-            with open(PRICE_HISTORY_FILE, "w", encoding="utf-8") as f:
-                json.dump(p, f, indent=4, ensure_ascii=False)
+                pass
+            return
+        for callback in self._listeners:
+            try:
+                callback(kind, title, message)
+            except Exception as e:
+                print("Erro ao notificar alerta:", e)
+
+    def _save_price_snapshot(self, data_state):
+        # acrescenta o último preço de cada símbolo ao histórico (append-only, compactado periodicamente)
+        try:
+            self.price_history.append_many(data_state)
         except Exception as e:
             print("Erro ao salvar price history:", e)
 
-    def check_alerts(self, window, data_state):
-        # always persist a snapshot of prices for history features
-        try:
-            self._save_price_snapshot(data_state)
-        except Exception:
-            pass
+    def check_alerts(self, data_state, symbols=None):
+        # batch path: evaluates every symbol (or just `symbols`) as if each had ticked
+        for sym in (symbols if symbols is not None else list(data_state)):
+            metrics = data_state.get(sym)
+            if metrics:
+                self.process_tick(sym, metrics)
+
+    def process_tick(self, symbol, metrics):
+        """Evaluates one symbol that just ticked. Runs on the websocket thread."""
+        now = self.clock()
+
+        # keep roughly one price per second per symbol in the history
+        price = metrics.get("price")
+        if (self.record_prices and price is not None
+                and now - self._last_snapshot.get(symbol, 0.0) >= PRICE_SNAPSHOT_INTERVAL):
+            self._last_snapshot[symbol] = now
+            try:
+                self.price_history.append(symbol, price)
+            except Exception as e:
+                print("Erro ao salvar price history:", e)
 
         # Auto alerts (simple rule-based)
         if AUTO_ENABLE:
-            for sym, metrics in data_state.items():
-                try:
-                    pct = float(metrics.get("price_change_percent", 0))
-                    # if absolute percent exceeds threshold, create a transient notification
-                    if abs(pct) >= AUTO_PERCENT_THRESHOLD:
-                        msg = f"{sym} variação {pct:.2f}% — verifique rapidamente."
-                        try:
-                            notify_user("Alerta Automático", msg)
-                        except Exception:
-                            pass
-                        # log but do not create persistent alert unless user wants
-                        self._log_alert_trigger(sym, "AutoDetecção", pct, metrics.get("price"))
-                except Exception:
-                    continue
-
-        if not self.active_alerts:
+            try:
+                pct = float(metrics.get("price_change_percent", 0))
+                # notify only when the symbol crosses into a new tier (edge-triggered)
+                tier = self.auto_detector.update(symbol, pct, now)
+                if tier is not None:
+                    msg = f"{symbol} variação {pct:.2f}% (faixa {tier:g}%) — verifique rapidamente."
+                    self._notify("auto", "Alerta Automático", msg)
+                    # log but do not create persistent alert unless user wants
+                    self._log_alert_trigger(symbol, "AutoDetecção", pct, price)
+            except Exception:
+                pass
+
+        if not len(self.engine):
             return
 
-        to_remove = []
+        derived = self.indicators.get(symbol) if self.indicators is not None else None
 
-        for i, alert in enumerate(list(self.active_alerts)):
+        with self._lock:
             try:
-                symbol = alert.get("symbol")
-                cond = alert.get("condition", "")
-                value = alert.get("value")
-                # robust convert
-                try:
-                    value = float(value)
-                except Exception:
-                    continue
-
-                if not symbol or symbol not in data_state:
-                    continue
-
-                if "Preço" in cond:
-                    cur = data_state[symbol].get("price")
-                else:
-                    cur = data_state[symbol].get("price_change_percent")
-
-                if cur is None:
-                    continue
-
-                hit = (
-                    ("Acima" in cond and cur > value) or
-                    ("Abaixo" in cond and cur < value)
-                )
-
-                if hit:
-                    # try system notification first
-                    try:
-                        notify_user("ALERTA ACIONADO", f"{symbol} atingiu {cond}: {cur}")
-                    except Exception:
-                        pass
-
-                    # fallback message box
-                    try:
-                        QMessageBox.critical(
-                            window,
-                            "ALERTA ACIONADO",
-                            f"{symbol} atingiu {cond}: {cur}"
-                        )
-                    except Exception:
-                        print(f"Alerta: {symbol} atingiu {cond}: {cur}")
-
-                    to_remove.append(i)
-                    # log trigger
-                    self._log_alert_trigger(symbol, cond, value, cur)
+                rules = self.engine.evaluate(symbol, metrics, derived, now)
             except Exception as e:
                 print("Erro ao processar alerta:", e)
-                continue
-
-        if to_remove:
-            self.active_alerts = [
-                a for idx, a in enumerate(self.active_alerts)
-                if idx not in to_remove
-            ]
+                return
+            if not rules:
+                return
+            fired_ids = {id(rule.alert) for rule in rules}
+            self.active_alerts = [a for a in self.active_alerts if id(a) not in fired_ids]
             self.save_alerts()
+
+        for rule in rules:
+            # rule.symbol may differ from `symbol` (spread alerts re-evaluated by the other leg)
+            cond = rule.alert.get("condition", "")
+            cur = rule.current
+            self._notify("alert", "ALERTA ACIONADO", f"{rule.symbol} atingiu {cond}: {cur:g}")
+            # log trigger
+            self._log_alert_trigger(rule.symbol, cond, rule.value, cur)
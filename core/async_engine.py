@@ -0,0 +1,268 @@
+# core/async_engine.py
+
+import asyncio
+import itertools
+import json
+import queue
+import random
+import threading
+import time
+
+from core.utils import POPULAR_NAMES, select_top_tickers, select_usdt_tickers
+from core.connections import STREAM_URL, MAX_STREAMS_PER_CONNECTION, BACKOFF_MIN, BACKOFF_MAX, PING_INTERVAL
+from core.klines import BINANCE_REST_URL, REQUEST_TIMEOUT
+
+TICKER_24HR_PATH = "/api/v3/ticker/24hr"
+ALL_MARKET_STREAM = "!miniTicker@arr"
+
+
+class AsyncMarketEngine:
+    """Bootstrap REST, streams de ticker e klines num único event loop asyncio.
+
+    Tudo o que chega é colocado em `self.queue` como (tipo, dados):
+      ("allowed", {pares} | None)   — pares em negociação (exchangeInfo, mercado completo)
+      ("bootstrap", [tickers 24h])  — resultado da coleta inicial
+      ("ticker", frame_bruto)       — cada mensagem do websocket
+    Quem consome (o MarketFeed) esvazia essa fila na sua própria thread. As demais chamadas
+    REST (exchangeInfo, klines via `submit`) usam a mesma sessão aiohttp neste event loop.
+    """
+
+    def __init__(self, out_queue=None, rest_url=BINANCE_REST_URL, stream_url=STREAM_URL,
+                 max_streams=MAX_STREAMS_PER_CONNECTION, stream_suffix="@ticker", full_market=False,
+                 symbols=None):
+        self.queue = out_queue if out_queue is not None else queue.SimpleQueue()
+        self.rest_url = rest_url.rstrip("/")
+        self.stream_url = stream_url.rstrip("/")
+        self.max_streams = max_streams
+        self.stream_suffix = stream_suffix
+        self.full_market = full_market
+        self.symbols = symbols   # SymbolDirectory: exchangeInfo no modo mercado completo
+        self.allowed = None   # pares aceitos no modo mercado completo (None = todos os USDT)
+        self.initial_symbols = None   # se definido, os streams abrem sem esperar o bootstrap
+
+        self.loop = None
+        self.session = None
+        self._thread = None
+        self._main_task = None
+        self._ready = threading.Event()
+        self._shards = {}     # shard id -> streams, websocket aberto e estatísticas para health()
+        self._tasks = set()   # streams e envios de SUBSCRIBE em andamento
+        self._request_ids = itertools.count(1)
+
+    # ----------------------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------------------
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run_loop, daemon=True, name="async-engine")
+        self._thread.start()
+        self._ready.wait(timeout=5)
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._main_task = self.loop.create_task(self._main())
+        self._ready.set()
+        try:
+            self.loop.run_until_complete(self._main_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+
+    def stop(self):
+        if self.loop and self._main_task and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._main_task.cancel)
+            except RuntimeError:
+                pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=2)
+
+    async def _main(self):
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            self.session = session
+            try:
+                if self.full_market:
+                    # um único stream de array cobre o mercado inteiro; o REST só preenche a tabela
+                    self.add_streams([ALL_MARKET_STREAM])
+                    await self._load_allowed()
+                    await self._bootstrap()
+                else:
+                    # streams abrem já com os símbolos conhecidos; os que a coleta REST
+                    # encontrar depois entram nas conexões com espaço ou em conexões novas
+                    if self.initial_symbols:
+                        self.add_symbols(self.initial_symbols)
+                    self.add_symbols(await self._bootstrap())
+                await asyncio.Event().wait()   # até stop() cancelar
+            finally:
+                tasks = list(self._tasks)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ----------------------------------------------------
+    # REST
+    # ----------------------------------------------------
+
+    async def get_json(self, url, params=None):
+        if self.session is None:
+            raise RuntimeError("sessão HTTP ainda não aberta")
+        async with self.session.get(url, params=params) as response:
+            return await response.json(content_type=None)
+
+    async def _load_allowed(self):
+        directory = self.symbols
+        if directory is None:
+            return
+        directory.load(refresh=False)
+        if directory.stale():
+            try:
+                directory.apply(await self.get_json(directory.url))
+            except Exception as e:
+                print("Erro ao buscar exchangeInfo:", e)
+        self.allowed = directory.trading_symbols() or None
+        self.queue.put(("allowed", self.allowed))
+
+    async def _bootstrap(self):
+        try:
+            tickers = await self.get_json(self.rest_url + TICKER_24HR_PATH)
+            if self.full_market:
+                top = select_usdt_tickers(tickers, self.allowed)
+            else:
+                top = select_top_tickers(tickers)
+            self.queue.put(("bootstrap", top))
+            return [t["symbol"] for t in top]
+        except Exception as e:
+            print("Erro na coleta inicial:", e)
+            return [f"{s}USDT" for s in POPULAR_NAMES.keys()]
+
+    def submit(self, coro):
+        """Agenda uma corrotina no event loop do motor (de qualquer thread); devolve um Future."""
+        if self.loop is None or self.loop.is_closed():
+            coro.close()
+            raise RuntimeError("motor assíncrono não está rodando")
+
+        async def tracked():
+            # entra no mesmo conjunto dos streams: stop() cancela também as requisições em curso
+            task = asyncio.current_task()
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return await coro
+        return asyncio.run_coroutine_threadsafe(tracked(), self.loop)
+
+    def call_soon(self, callback):
+        """Roda `callback()` no event loop do motor (ex: abrir o banco de séries)."""
+        if self.loop is None or self.loop.is_closed():
+            raise RuntimeError("motor assíncrono não está rodando")
+        self.loop.call_soon_threadsafe(callback)
+
+    # ----------------------------------------------------
+    # Inscrição (roda na thread do event loop)
+    # ----------------------------------------------------
+
+    def add_symbols(self, symbols):
+        self.add_streams([f"{s.lower()}{self.stream_suffix}" for s in symbols])
+
+    def add_streams(self, streams):
+        current = {s for stats in self._shards.values() for s in stats["stream_list"]}
+        pending = [s for s in dict.fromkeys(streams) if s not in current]
+
+        # completa as conexões com espaço: SUBSCRIBE se já abertas, senão entram na próxima URL
+        for stats in self._shards.values():
+            room = self.max_streams - len(stats["stream_list"])
+            if room <= 0 or not pending:
+                continue
+            take, pending = pending[:room], pending[room:]
+            stats["stream_list"].extend(take)
+            stats["streams"] = len(stats["stream_list"])
+            if stats["ws"] is not None:
+                self._spawn(self._send(stats["ws"], "SUBSCRIBE", take))
+
+        # o resto vai para conexões novas
+        for i in range(0, len(pending), self.max_streams):
+            shard_id = len(self._shards)
+            stats = self._shards[shard_id] = {
+                "id": shard_id, "stream_list": pending[i:i + self.max_streams], "ws": None,
+                "connected": False, "messages": 0, "last_message_at": None, "reconnects": 0,
+                "rate_sample": (time.monotonic(), 0),
+            }
+            stats["streams"] = len(stats["stream_list"])
+            self._spawn(self._stream(stats))
+
+    def _spawn(self, coro):
+        # a task sai do conjunto ao terminar: envios de SUBSCRIBE não se acumulam
+        task = self.loop.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _send(self, ws, method, streams):
+        try:
+            await ws.send(json.dumps({"method": method, "params": streams,
+                                      "id": next(self._request_ids)}))
+        except Exception as e:
+            print("Erro ao atualizar inscrição:", e)
+
+    # ----------------------------------------------------
+    # WebSocket
+    # ----------------------------------------------------
+
+    async def _stream(self, stats):
+        import websockets
+
+        backoff = BACKOFF_MIN
+        put = self.queue.put
+
+        while True:
+            opened_at = time.monotonic()
+            # a URL leva os streams atuais: reconectar já reinscreve tudo
+            in_url = len(stats["stream_list"])
+            url = f"{self.stream_url}/stream?streams={'/'.join(stats['stream_list'])}"
+            try:
+                async with websockets.connect(url, ping_interval=PING_INTERVAL, max_size=None) as ws:
+                    stats["connected"] = True
+                    stats["ws"] = ws
+                    # streams acrescentados durante o handshake (a lista só cresce)
+                    added = stats["stream_list"][in_url:]
+                    if added:
+                        await self._send(ws, "SUBSCRIBE", added)
+                    async for msg in ws:
+                        stats["messages"] += 1
+                        stats["last_message_at"] = time.monotonic()
+                        put(("ticker", msg))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Erro na conexão websocket:", e)
+            stats["connected"] = False
+            stats["ws"] = None
+
+            if time.monotonic() - opened_at > BACKOFF_MAX:
+                backoff = BACKOFF_MIN
+            stats["reconnects"] += 1
+            await asyncio.sleep(backoff * (0.5 + random.random()))
+            backoff = min(backoff * 2, BACKOFF_MAX)
+
+    def health(self):
+        now = time.monotonic()
+        result = []
+        for stats in list(self._shards.values()):
+            last_time, last_count = stats["rate_sample"]
+            elapsed = now - last_time
+            rate = (stats["messages"] - last_count) / elapsed if elapsed > 0 else 0.0
+            if elapsed >= 1.0:
+                stats["rate_sample"] = (now, stats["messages"])
+            last = stats["last_message_at"]
+            result.append({
+                "id": stats["id"],
+                "streams": stats["streams"],
+                "connected": stats["connected"],
+                "messages_per_sec": rate,
+                "last_message_age": None if last is None else now - last,
+                "reconnects": stats["reconnects"],
+            })
+        return result
@@ -0,0 +1,62 @@
+# core/auto_detect.py
+
+import time
+from bisect import bisect_right
+
+
+class _SymbolState:
+    __slots__ = ("last_pct", "level", "fired_level", "fired_at")
+
+    def __init__(self):
+        self.last_pct = None
+        self.level = 0          # faixa em que o símbolo está (0 = fora de todas)
+        self.fired_level = 0    # última faixa notificada
+        self.fired_at = 0.0
+
+
+class AutoDetector:
+    """Detecção automática por borda: só dispara quando o símbolo entra numa faixa de variação.
+
+    Para sair de uma faixa a variação precisa cair `hysteresis` pontos abaixo dela; a mesma
+    faixa (ou uma menor) só volta a notificar depois de `cooldown` segundos. Subir para uma
+    faixa maior sempre notifica.
+    """
+
+    def __init__(self, tiers=(3.0, 5.0, 10.0), hysteresis=0.5, cooldown=300.0):
+        self.tiers = sorted(tiers)
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self._state = {}
+
+    def update(self, symbol, pct, now=None):
+        """Retorna a faixa atingida (ex: 5.0) quando deve notificar, senão None."""
+        st = self._state.get(symbol)
+        if st is None:
+            st = self._state[symbol] = _SymbolState()
+        elif pct == st.last_pct:
+            return None
+        st.last_pct = pct
+
+        magnitude = abs(pct)
+        level = bisect_right(self.tiers, magnitude)
+
+        # re-arma as faixas das quais o símbolo saiu com folga
+        while st.level > level and magnitude < self.tiers[st.level - 1] - self.hysteresis:
+            st.level -= 1
+
+        if level <= st.level:
+            return None
+
+        st.level = level
+        now = time.time() if now is None else now
+        if level > st.fired_level or now - st.fired_at >= self.cooldown:
+            st.fired_level = level
+            st.fired_at = now
+            return self.tiers[level - 1]
+        return None
+
+    def reset(self, symbol=None):
+        if symbol is None:
+            self._state.clear()
+        else:
+            self._state.pop(symbol, None)
@@ -0,0 +1,241 @@
+# core/connections.py
+
+import itertools
+import json
+import math
+import random
+import threading
+import time
+
+from websocket import WebSocketApp
+
+STREAM_URL = "wss://stream.binance.com:9443"
+MAX_STREAMS_PER_CONNECTION = 200   # a Binance aceita até 1024, mas conexões menores reconectam mais rápido
+BACKOFF_MIN = 1.0
+BACKOFF_MAX = 60.0
+PING_INTERVAL = 20
+
+
+class StreamConnection:
+    """Uma conexão websocket de streams combinados, com reconexão automática (backoff + jitter)."""
+
+    def __init__(self, conn_id, base_url, on_message, streams=(),
+                 backoff_min=BACKOFF_MIN, backoff_max=BACKOFF_MAX):
+        self.conn_id = conn_id
+        self.base_url = base_url.rstrip("/")
+        self.on_message = on_message
+        self.streams = list(streams)
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+
+        self.ws = None
+        self.connected = False
+        self.reconnects = 0
+        self.messages = 0
+        self.last_message_at = None
+
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()   # avisa a thread quando chegam streams
+        self._thread = None
+        self._request_ids = itertools.count(1)
+        self._url_streams = []   # streams embutidos na URL da conexão atual
+        self._rate_sample = (time.monotonic(), 0)
+
+    # ----------------------------------------------------
+    # Ciclo de vida
+    # ----------------------------------------------------
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name=f"ws-{self.conn_id}")
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        try:
+            if self.ws:
+                self.ws.close()
+        except Exception:
+            pass
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1)
+
+    def _url(self):
+        with self._lock:
+            self._url_streams = list(self.streams)
+            streams = "/".join(self._url_streams)
+        return f"{self.base_url}/stream?streams={streams}"
+
+    def _run(self):
+        backoff = self.backoff_min
+        while not self._stop_event.is_set():
+            if not self.streams:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+
+            # a URL leva os streams atuais: reconectar já reinscreve tudo
+            self.ws = WebSocketApp(
+                self._url(),
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_close=self._on_close,
+            )
+            opened_at = time.monotonic()
+            try:
+                self.ws.run_forever(ping_interval=PING_INTERVAL)
+            except Exception as e:
+                print("Erro na conexão websocket:", e)
+            self.connected = False
+
+            if self._stop_event.is_set():
+                break
+
+            # conexão que durou bastante volta ao backoff mínimo
+            if time.monotonic() - opened_at > self.backoff_max:
+                backoff = self.backoff_min
+            delay = backoff * (0.5 + random.random())   # jitter de ±50%
+            self.reconnects += 1
+            self._stop_event.wait(delay)
+            backoff = min(backoff * 2, self.backoff_max)
+
+    def _on_open(self, ws):
+        # streams incluídos/removidos durante o handshake não estão na URL nem foram enviados
+        # (connected ainda era False): acerta a diferença agora
+        with self._lock:
+            self.connected = True
+            current = set(self.streams)
+            sent = set(self._url_streams)
+            added = [s for s in self.streams if s not in sent]
+            removed = [s for s in self._url_streams if s not in current]
+            self._url_streams = list(self.streams)
+        if removed:
+            self._send("UNSUBSCRIBE", removed)
+        if added:
+            self._send("SUBSCRIBE", added)
+
+    def _on_close(self, ws, *args):
+        self.connected = False
+
+    def _on_message(self, ws, msg):
+        self.messages += 1
+        self.last_message_at = time.monotonic()
+        self.on_message(ws, msg)
+
+    # ----------------------------------------------------
+    # Inscrição dinâmica
+    # ----------------------------------------------------
+
+    def subscribe(self, streams):
+        with self._lock:
+            new = [s for s in streams if s not in self.streams]
+            self.streams.extend(new)
+        if new:
+            self._wake.set()
+            self._send("SUBSCRIBE", new)
+
+    def unsubscribe(self, streams):
+        with self._lock:
+            gone = [s for s in streams if s in self.streams]
+            self.streams = [s for s in self.streams if s not in gone]
+        if gone:
+            self._send("UNSUBSCRIBE", gone)
+
+    def _send(self, method, streams):
+        # se não estiver conectado, a próxima conexão já usa a lista nova
+        if not self.connected or self.ws is None:
+            return
+        try:
+            self.ws.send(json.dumps({"method": method, "params": streams,
+                                     "id": next(self._request_ids)}))
+        except Exception as e:
+            print("Erro ao atualizar inscrição:", e)
+
+    # ----------------------------------------------------
+    # Saúde
+    # ----------------------------------------------------
+
+    def health(self):
+        now = time.monotonic()
+        last_time, last_count = self._rate_sample
+        elapsed = now - last_time
+        rate = (self.messages - last_count) / elapsed if elapsed > 0 else 0.0
+        if elapsed >= 1.0:
+            self._rate_sample = (now, self.messages)
+
+        return {
+            "id": self.conn_id,
+            "streams": len(self.streams),
+            "connected": self.connected,
+            "messages_per_sec": rate,
+            "last_message_age": None if self.last_message_at is None else now - self.last_message_at,
+            "reconnects": self.reconnects,
+        }
+
+
+class ConnectionManager:
+    """Distribui os streams dos símbolos entre N conexões e mantém a divisão equilibrada."""
+
+    def __init__(self, on_message, base_url=STREAM_URL, max_streams=MAX_STREAMS_PER_CONNECTION,
+                 stream_suffix="@ticker"):
+        self.on_message = on_message
+        self.base_url = base_url
+        self.max_streams = max_streams
+        self.stream_suffix = stream_suffix
+        self.connections = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+
+    def _stream(self, symbol):
+        return f"{symbol.lower()}{self.stream_suffix}"
+
+    def add_symbols(self, symbols):
+        self.add_streams([self._stream(s) for s in symbols])
+
+    def add_streams(self, streams):
+        with self._lock:
+            current = {s for c in self.connections for s in c.streams}
+            pending = [s for s in dict.fromkeys(streams) if s not in current]
+            if not pending:
+                return
+
+            total = len(current) + len(pending)
+            needed = max(1, math.ceil(total / self.max_streams))
+            while len(self.connections) < needed:
+                conn = StreamConnection(next(self._ids), self.base_url, self.on_message)
+                self.connections.append(conn)
+                conn.start()
+
+            self._rebalance(pending, math.ceil(total / len(self.connections)))
+
+    def remove_symbols(self, symbols):
+        gone = {self._stream(s) for s in symbols}
+        with self._lock:
+            for conn in self.connections:
+                conn.unsubscribe([s for s in conn.streams if s in gone])
+
+    def _rebalance(self, pending, target):
+        # tira o excesso das conexões mais cheias e distribui junto com os streams novos
+        moved = []
+        for conn in self.connections:
+            extra = len(conn.streams) - target
+            if extra > 0:
+                take = conn.streams[-extra:]
+                conn.unsubscribe(take)
+                moved.extend(take)
+
+        queue = moved + pending
+        for conn in sorted(self.connections, key=lambda c: len(c.streams)):
+            room = target - len(conn.streams)
+            if room > 0 and queue:
+                conn.subscribe(queue[:room])
+                queue = queue[room:]
+
+    def health(self):
+        return [c.health() for c in self.connections]
+
+    def stop(self):
+        for conn in self.connections:
+            conn.stop()
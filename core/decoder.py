@@ -0,0 +1,196 @@
+# core/decoder.py
+
+import json
+import re
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from core.market_state import MarketRecord
+
+
+# ----------------------------------------------------
+# Backends — todos recebem o frame bruto do stream combinado
+# ({"stream": ..., "data": {...}}) e devolvem um MarketRecord novo ou None
+# ----------------------------------------------------
+
+def _from_dict(d):
+    return MarketRecord(
+        d["s"], float(d["c"]), float(d["o"]), float(d["P"]),
+        float(d["h"]), float(d["l"]), float(d["v"]),
+    )
+
+
+def _from_array_item(d):
+    # !ticker@arr traz "P"; !miniTicker@arr não, então a variação vem de c/o
+    price = float(d["c"])
+    open_price = float(d["o"])
+    pct = d.get("P")
+    if pct is None:
+        pct = (price - open_price) / open_price * 100 if open_price else 0.0
+    return MarketRecord(
+        d["s"], price, open_price, float(pct),
+        float(d["h"]), float(d["l"]), float(d["v"]),
+    )
+
+
+def _array_items(frame):
+    # stream combinado ({"stream": ..., "data": [...]}) ou conexão direta ([...])
+    return frame.get("data") if isinstance(frame, dict) else frame
+
+
+def _records_from_array(items):
+    records = []
+    for d in items or ():
+        try:
+            records.append(_from_array_item(d))
+        except (ValueError, KeyError, TypeError):
+            continue
+    return records
+
+
+def _decode_json(raw):
+    try:
+        data = json.loads(raw).get("data")
+        return _from_dict(data) if data and "s" in data else None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+# campos de uma letra com valor string ("c":"123.4"); no @ticker nenhum outro objeto os repete
+_TICKER_FIELDS = re.compile(r'"([scoPhlv])":\s*"([^"\\]*)"')
+
+
+def _decode_re(raw):
+    # biblioteca padrão sem montar o dict do frame inteiro: só os 7 campos usados
+    try:
+        d = dict(_TICKER_FIELDS.findall(raw))
+        return MarketRecord(
+            d["s"], float(d["c"]), float(d["o"]), float(d["P"]),
+            float(d["h"]), float(d["l"]), float(d["v"]),
+        )
+    except KeyError:
+        # outro tipo de frame ou valor com escape: o json decide
+        return _decode_json(raw)
+    except (ValueError, TypeError):
+        return None
+
+
+def _decode_orjson(raw):
+    try:
+        data = orjson.loads(raw).get("data")
+        return _from_dict(data) if data and "s" in data else None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+
+
+def _decode_array_json(raw):
+    try:
+        return _records_from_array(_array_items(json.loads(raw)))
+    except ValueError:
+        return []
+
+
+def _decode_array_orjson(raw):
+    try:
+        return _records_from_array(_array_items(orjson.loads(raw)))
+    except ValueError:
+        return []
+
+
+if msgspec is not None:
+    class _MsTicker(msgspec.Struct):
+        # só os campos necessários; o resto do frame nem é materializado
+        s: str
+        c: str
+        o: str
+        P: str
+        h: str
+        l: str
+        v: str
+
+    class _MsFrame(msgspec.Struct):
+        data: _MsTicker
+
+    class _MsMini(msgspec.Struct):
+        s: str
+        c: str
+        o: str
+        h: str
+        l: str
+        v: str
+        P: str = ""
+
+    class _MsArrayFrame(msgspec.Struct):
+        data: list[_MsMini]
+
+    _ms_decoder = msgspec.json.Decoder(_MsFrame)
+    # stream combinado ou conexão direta (lista pura), como _array_items
+    _ms_array_decoder = msgspec.json.Decoder(_MsArrayFrame | list[_MsMini])
+
+    def _decode_msgspec(raw):
+        try:
+            d = _ms_decoder.decode(raw).data
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            return None
+        try:
+            return MarketRecord(
+                d.s, float(d.c), float(d.o), float(d.P),
+                float(d.h), float(d.l), float(d.v),
+            )
+        except ValueError:
+            return None
+
+
+    def _decode_array_msgspec(raw):
+        try:
+            frame = _ms_array_decoder.decode(raw)
+            items = frame.data if isinstance(frame, _MsArrayFrame) else frame
+        except (msgspec.DecodeError, msgspec.ValidationError):
+            return []
+        records = []
+        for d in items:
+            try:
+                price = float(d.c)
+                open_price = float(d.o)
+                if d.P:
+                    pct = float(d.P)
+                else:
+                    pct = (price - open_price) / open_price * 100 if open_price else 0.0
+                records.append(MarketRecord(
+                    d.s, price, open_price, pct, float(d.h), float(d.l), float(d.v),
+                ))
+            except ValueError:
+                continue
+        return records
+
+
+BACKENDS = {"json": _decode_json, "re": _decode_re}
+ARRAY_BACKENDS = {"json": _decode_array_json}
+if orjson is not None:
+    BACKENDS["orjson"] = _decode_orjson
+    ARRAY_BACKENDS["orjson"] = _decode_array_orjson
+if msgspec is not None:
+    BACKENDS["msgspec"] = _decode_msgspec
+    ARRAY_BACKENDS["msgspec"] = _decode_array_msgspec
+
+
+def get_decoder(name=None, array=False):
+    """Retorna (nome, função) do backend pedido ou do mais rápido instalado."""
+    backends = ARRAY_BACKENDS if array else BACKENDS
+    if name:
+        return name, backends[name]
+    for candidate in ("msgspec", "orjson", "re", "json"):
+        if candidate in backends:
+            return candidate, backends[candidate]
+
+
+BACKEND, decode_ticker = get_decoder()
+_, decode_ticker_array = get_decoder(array=True)
@@ -0,0 +1,408 @@
+# core/feed.py
+
+import os
+import queue
+import threading
+import time
+
+from core.utils import POPULAR_NAMES, select_top_tickers, select_usdt_tickers
+from core.market_state import MarketState, MarketRecord
+from core.connections import ConnectionManager, STREAM_URL
+from core.decoder import decode_ticker, decode_ticker_array
+from core.symbols import SymbolDirectory
+from core.indicators import IndicatorEngine
+from core.tsdb import TSDB_FILE
+
+UI_MAX_RATE = 20  # máximo de emissões de atualização por segundo
+
+# "thread": websocket-client + binance-connector (uma thread por conexão)
+# "async": AsyncMarketEngine (websockets + aiohttp num único event loop)
+ENGINE_THREAD = "thread"
+ENGINE_ASYNC = "async"
+DEFAULT_ENGINE = ENGINE_THREAD
+
+# mercado completo: todos os pares USDT por um único stream de array, em vez de POPULAR_NAMES
+FULL_MARKET = False
+ALL_MARKET_STREAM = "!miniTicker@arr"
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+SNAPSHOT_FILE = os.path.join(RESOURCES_DIR, "market_snapshot.bin")   # estado + históricos da última sessão
+SNAPSHOT_INTERVAL = 60   # segundos entre snapshots periódicos (0 = só ao parar)
+
+
+class MarketFeed:
+    """Núcleo de dados de mercado sem Qt: REST inicial, websockets, estado, indicadores e ticks.
+
+    A GUI usa o BinanceWorker (core/worker.py), que só repassa `add_update_listener` para um
+    sinal Qt; o modo headless (core/headless.py) usa esta classe diretamente.
+    """
+
+    def __init__(self, max_rate=UI_MAX_RATE, stream_url=STREAM_URL, engine=DEFAULT_ENGINE,
+                 full_market=FULL_MARKET, snapshot_file=SNAPSHOT_FILE,
+                 snapshot_interval=SNAPSHOT_INTERVAL, tsdb_file=TSDB_FILE):
+        self.keep_running = True
+        self.engine_mode = engine
+        self.full_market = full_market
+        self.snapshot_file = snapshot_file
+        self.snapshot_interval = snapshot_interval
+        self.client = None      # binance Spot, criado na primeira coleta REST
+        self.connections = None
+        self.engine = None
+
+        # metadados dos pares (exchangeInfo em cache); POPULAR_NAMES só para exibição
+        self.symbols = SymbolDirectory()
+        self._allowed = None
+        self._handle_frame = self._on_array_message if full_market else self._on_message
+
+        if engine == ENGINE_ASYNC:
+            from core.async_engine import AsyncMarketEngine
+            self.engine = AsyncMarketEngine(stream_url=stream_url, full_market=full_market,
+                                            symbols=self.symbols)
+        else:
+            self.connections = ConnectionManager(self._handle_frame, base_url=stream_url)
+
+        # indicadores derivados (SMA/EMA/RSI/...) atualizados antes de qualquer outro handler,
+        # para que alertas já leiam os valores do tick atual
+        self.indicators = IndicatorEngine()
+        self._tick_handlers = [self.indicators.update]
+
+        # candles OHLCV locais (1s/1m/5m/1h) para gráficos e histórico, gravados em lote;
+        # o SQLite abre fora da thread da GUI, junto com a coleta REST (ver run/open_tsdb)
+        self.tsdb_file = tsdb_file
+        self._tsdb = None
+        self._tsdb_lock = threading.Lock()
+        self._update_listeners = []
+        self.recorder = None   # TickRecorder ativo (core/recorder.py), se houver
+
+        # estado próprio desta instância; leitores usam snapshots sem lock
+        self.state = MarketState()
+        self._emitted_version = 0
+        self._emit_interval = 1.0 / max_rate
+        self._emit_thread = None
+        self._stop_event = threading.Event()
+
+        # último estado conhecido: tabela, gráficos e indicadores prontos antes do REST/websocket
+        self._cached = {}
+        self._snapshot_due = time.monotonic() + snapshot_interval
+        self._snapshot_lock = threading.Lock()   # thread de emissão x stop()
+        if snapshot_file:
+            self.load_snapshot()
+
+    @property
+    def data_state(self):
+        # snapshot consistente {symbol: registro}; os registros nunca são alterados depois de publicados
+        return self.state.snapshot()
+
+    @property
+    def tsdb(self):
+        return self.open_tsdb()
+
+    def open_tsdb(self):
+        """Banco de séries (core/tsdb.py), aberto no primeiro uso; None se desligado ou parado."""
+        if self._tsdb is None and self.tsdb_file and self.keep_running:
+            with self._tsdb_lock:
+                if self._tsdb is None:
+                    from core.tsdb import TimeSeriesStore
+                    try:
+                        store = TimeSeriesStore(self.tsdb_file)
+                    except Exception as e:
+                        print("Erro ao abrir banco de séries:", e)
+                        self.tsdb_file = None
+                        return None
+                    self._tsdb = store
+                    self.add_tick_handler(store.on_tick)
+        return self._tsdb
+
+    def process_frame(self, raw):
+        """Aplica um frame bruto como se tivesse chegado pelo websocket (replay, testes)."""
+        self._handle_frame(None, raw)
+
+    def add_tick_handler(self, handler):
+        # handler(symbol, metrics) é chamado na thread do websocket a cada tick;
+        # a lista é trocada (não alterada) para não mexer nela durante a iteração
+        self._tick_handlers = self._tick_handlers + [handler]
+
+    def remove_tick_handler(self, handler):
+        self._tick_handlers = [h for h in self._tick_handlers if h != handler]
+
+    def add_update_listener(self, listener):
+        # listener({symbol: registro}) recebe os deltas agrupados, no máximo max_rate vezes por segundo
+        self._update_listeners = self._update_listeners + [listener]
+
+    def start_recording(self, path=None):
+        # grava os frames brutos recebidos para reprodução posterior (python -m core.recorder)
+        from core.recorder import TickRecorder
+        self.stop_recording()
+        self.recorder = TickRecorder(path)
+        return self.recorder.path
+
+    def stop_recording(self):
+        recorder, self.recorder = self.recorder, None
+        if recorder is not None:
+            recorder.close()
+
+    # ----------------------------------------------------
+    # REST → coleta inicial
+    # ----------------------------------------------------
+
+    def _rest(self):
+        # binance-connector só é importado quando a coleta REST roda (fora da thread da GUI)
+        if self.client is None:
+            from binance.spot import Spot
+            self.client = Spot()   # REST sem autenticação
+        return self.client
+
+    def get_top_symbols(self):
+        try:
+            top = select_top_tickers(self._rest().ticker_24hr())
+            self._apply_tickers(top)
+            return [t["symbol"] for t in top]
+
+        except Exception:
+            return [f"{s}USDT" for s in POPULAR_NAMES.keys()]
+
+    def get_all_symbols(self):
+        # modo mercado completo: todos os pares USDT em negociação segundo o exchangeInfo
+        self.symbols.load()
+        allowed = self.symbols.trading_symbols() or None
+        self._allowed = allowed
+        try:
+            top = select_usdt_tickers(self._rest().ticker_24hr(), allowed)
+            self._apply_tickers(top)
+            return [t["symbol"] for t in top]
+        except Exception:
+            return sorted(allowed) if allowed else [f"{s}USDT" for s in POPULAR_NAMES.keys()]
+
+    def _apply_tickers(self, tickers):
+        # a coleta REST roda junto com os websockets: não sobrescreve símbolo que já recebeu
+        # tick ao vivo (só os ausentes ou ainda com o registro do cache)
+        get = self.state.get
+        cached = self._cached
+        self.state.publish_many([
+            MarketRecord(
+                t["symbol"],
+                price=float(t["lastPrice"]),
+                open_price=float(t["openPrice"]),
+                price_change_percent=float(t["priceChangePercent"]),
+                high_price=float(t["highPrice"]),
+                low_price=float(t["lowPrice"]),
+                volume=float(t["volume"]),
+            )
+            for t in tickers
+            if get(t["symbol"]) is None or get(t["symbol"]) is cached.get(t["symbol"])
+        ])
+
+    # ----------------------------------------------------
+    # Último estado conhecido (início rápido)
+    # ----------------------------------------------------
+
+    def load_snapshot(self):
+        # registros + históricos: a tabela e os gráficos ao vivo já abrem preenchidos e os
+        # indicadores partem da janela salva, sem aquecimento
+        from core.snapshot import read_snapshot, SnapshotError
+        try:
+            _saved_at, items = read_snapshot(self.snapshot_file)
+        except FileNotFoundError:
+            return 0
+        except (OSError, SnapshotError) as e:
+            print("Erro ao carregar snapshot:", e)
+            return 0
+        self.state.restore(items)
+        self.indicators.recompute({record.symbol: prices for record, prices in items})
+        self._cached = {record.symbol: record for record, _ in items}
+        return len(items)
+
+    def save_snapshot(self):
+        if not self.snapshot_file:
+            return
+        from core.snapshot import write_snapshot
+        try:
+            with self._snapshot_lock:
+                write_snapshot(self.snapshot_file, self.state.snapshot(), self.state.histories())
+        except OSError as e:
+            print("Erro ao salvar snapshot:", e)
+
+    def _maybe_snapshot(self):
+        # chamado pela thread de emissão: snapshot periódico fora do caminho dos ticks
+        if not self.snapshot_interval or not self.snapshot_file:
+            return
+        now = time.monotonic()
+        if now >= self._snapshot_due:
+            self._snapshot_due = now + self.snapshot_interval
+            self.save_snapshot()
+
+    def initial_symbols(self):
+        # streams abertos já no início, sem esperar o REST: cache + pares populares
+        popular = [f"{s}USDT" for s in POPULAR_NAMES.keys()]
+        return list(dict.fromkeys(list(self._cached) + popular))
+
+    # ----------------------------------------------------
+    # WebSocket — mensagem recebida
+    # ----------------------------------------------------
+
+    def _on_message(self, ws, msg):
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(msg)
+
+        # decodifica só os campos do ticker direto num MarketRecord novo
+        # (msgspec/orjson quando instalados): uma alocação por tick
+        metrics = decode_ticker(msg)
+        if metrics is None:
+            return
+
+        symbol = metrics.symbol
+        last = self.state.get(symbol)
+        if last is not None:
+            price = metrics.price
+            metrics.trend = "up" if price > last.price else "down" if price < last.price else "flat"
+
+        self.state.publish(metrics)
+
+        # alertas avaliados só para o símbolo que mudou, sem passar pela GUI
+        for handler in self._tick_handlers:
+            try:
+                handler(symbol, metrics)
+            except Exception as e:
+                print("Erro ao processar tick:", e)
+
+    def _on_array_message(self, ws, msg):
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record(msg)
+
+        # !miniTicker@arr: um frame com todos os pares que mudaram no último segundo
+        records = decode_ticker_array(msg)
+        if not records:
+            return
+
+        allowed = self._allowed
+        get = self.state.get
+        batch = []
+        for rec in records:
+            symbol = rec.symbol
+            if allowed is not None:
+                if symbol not in allowed:
+                    continue
+            elif not symbol.endswith("USDT"):
+                continue
+            last = get(symbol)
+            if last is not None:
+                rec.trend = "up" if rec.price > last.price else "down" if rec.price < last.price else "flat"
+            batch.append(rec)
+
+        self.state.publish_many(batch)
+
+        for handler in self._tick_handlers:
+            for rec in batch:
+                try:
+                    handler(rec.symbol, rec)
+                except Exception as e:
+                    print("Erro ao processar tick:", e)
+
+    # ----------------------------------------------------
+    # Emissão para a GUI / sinks — agrupada e limitada a max_rate por segundo
+    # ----------------------------------------------------
+
+    def _emit_changed(self):
+        # só os símbolos que mudaram desde a última emissão
+        version, delta = self.state.changed_since(self._emitted_version)
+        self._emitted_version = version
+        if delta:
+            for listener in self._update_listeners:
+                try:
+                    listener(delta)
+                except Exception as e:
+                    print("Erro ao emitir atualização:", e)
+
+    def _emit_loop(self):
+        while not self._stop_event.wait(self._emit_interval):
+            self._emit_changed()
+            self._maybe_snapshot()
+
+    def _drain_loop(self):
+        # modo async: a fila do motor é a única ponte; esta thread aplica os frames e emite
+        q = self.engine.queue
+        deadline = time.monotonic() + self._emit_interval
+        while not self._stop_event.is_set():
+            try:
+                kind, payload = q.get(timeout=max(0.0, deadline - time.monotonic()))
+                if kind == "ticker":
+                    self._handle_frame(None, payload)
+                elif kind == "bootstrap":
+                    self._apply_tickers(payload)
+                elif kind == "allowed":
+                    self._allowed = payload
+            except queue.Empty:
+                pass
+
+            now = time.monotonic()
+            if now >= deadline:
+                self._emit_changed()
+                self._maybe_snapshot()
+                deadline = now + self._emit_interval
+
+    def connection_health(self):
+        if self.engine is not None:
+            return self.engine.health()
+        return self.connections.health()
+
+    # ----------------------------------------------------
+    # Iniciar WebSocket
+    # ----------------------------------------------------
+
+    def run(self):
+        # nada aqui espera a rede: websockets abrem já com os símbolos conhecidos e a coleta
+        # REST (e o exchangeInfo no mercado completo) roda em segundo plano
+        if self.engine is not None:
+            # modo async: REST, exchangeInfo, streams, klines e a abertura do banco de séries
+            # rodam no event loop do motor; fora dele só fica a thread que esvazia a fila
+            if not self.full_market:
+                self.engine.initial_symbols = self.initial_symbols()
+            self.engine.start()
+            try:
+                self.engine.call_soon(self.open_tsdb)
+            except RuntimeError:
+                self.open_tsdb()
+            self._emit_thread = threading.Thread(target=self._drain_loop, daemon=True)
+            self._emit_thread.start()
+            return
+
+        threading.Thread(target=self.open_tsdb, daemon=True, name="tsdb-open").start()
+
+        if self.full_market:
+            # um único stream de array cobre o mercado inteiro
+            self.connections.add_streams([ALL_MARKET_STREAM])
+            bootstrap = self.get_all_symbols
+        else:
+            # streams divididos entre conexões, cada uma com reconexão automática
+            self.connections.add_symbols(self.initial_symbols())
+            bootstrap = lambda: self.connections.add_symbols(self.get_top_symbols())
+        threading.Thread(target=bootstrap, daemon=True, name="rest-bootstrap").start()
+
+        self._emit_thread = threading.Thread(target=self._emit_loop, daemon=True)
+        self._emit_thread.start()
+
+    # ----------------------------------------------------
+    # Parar de forma segura
+    # ----------------------------------------------------
+
+    def stop(self):
+        self.keep_running = False
+        self._stop_event.set()
+        # conexões primeiro: nenhum tick chega depois que gravador, snapshot e banco fecham
+        try:
+            if self.engine is not None:
+                self.engine.stop()
+            else:
+                self.connections.stop()
+        except:
+            pass
+        self.stop_recording()
+        self.save_snapshot()
+        with self._tsdb_lock:
+            store, self._tsdb = self._tsdb, None
+        if store is not None:
+            self.remove_tick_handler(store.on_tick)
+            store.close()
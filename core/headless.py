@@ -0,0 +1,52 @@
+# core/headless.py
+"""Monitor sem interface: MarketFeed + AlertManager + sinks, sem importar PyQt6."""
+import signal
+import threading
+import time
+
+from core.feed import MarketFeed
+from core.alerts import AlertManager
+from core.sinks import make_sink
+
+STATUS_INTERVAL = 60   # segundos entre linhas de status (0 desliga)
+
+
+def run_headless(sink_specs=("stdout",), engine=None, full_market=False, status_interval=STATUS_INTERVAL):
+    sinks = [make_sink(spec) for spec in sink_specs or ("stdout",)]
+
+    kwargs = {"full_market": full_market}
+    if engine:
+        kwargs["engine"] = engine
+    feed = MarketFeed(**kwargs)
+
+    # com o banco de séries ligado, o histórico de preços vem dele (sem gravar em dobro)
+    alerts = AlertManager(record_prices=not feed.tsdb_file)
+    alerts.attach_indicators(feed.indicators)
+    for sink in sinks:
+        alerts.add_listener(sink)
+    feed.add_tick_handler(alerts.process_tick)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            signal.signal(sig, lambda *_: stop.set())
+        except (ValueError, OSError):
+            pass   # fora da thread principal / plataforma sem o sinal
+
+    feed.run()
+    print(f"Monitor headless iniciado · {len(alerts.active_alerts)} alertas ativos", flush=True)
+
+    try:
+        while not stop.wait(status_interval or None):
+            health = feed.connection_health()
+            online = sum(1 for h in health if h["connected"])
+            rate = sum(h["messages_per_sec"] for h in health)
+            print(f"[{time.strftime('%H:%M:%S')}] {len(feed.state)} símbolos · "
+                  f"{online}/{len(health)} conexões · {rate:.0f} msg/s · "
+                  f"{len(alerts.active_alerts)} alertas", flush=True)
+    finally:
+        feed.stop()
+        alerts.save_alerts()
+        alerts.close()
+        for sink in sinks:
+            sink.close()
@@ -0,0 +1,334 @@
+# core/indicators.py
+
+import math
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+
+from core.ringbuffer import RingBuffer
+
+INDICATOR_WINDOW = 50     # ticks usados na SMA, volatilidade e VWAP
+EMA_SPAN = 20
+RSI_PERIOD = 14
+RESYNC_EVERY = 1000       # ticks entre recálculos exatos das somas (erro acumulado de ponto flutuante)
+
+INDICATOR_FIELDS = ("sma", "ema", "volatility", "rsi", "vwap")
+
+
+class Indicators(Mapping):
+    """Valores derivados de um símbolo; publicado de uma vez e nunca mais alterado."""
+
+    __slots__ = ("symbol", "samples") + INDICATOR_FIELDS
+
+    def __init__(self, symbol, samples=0, sma=None, ema=None, volatility=None, rsi=None, vwap=None):
+        self.symbol = symbol
+        self.samples = samples
+        self.sma = sma
+        self.ema = ema
+        self.volatility = volatility   # desvio padrão dos retornos log por tick, em %
+        self.rsi = rsi
+        self.vwap = vwap
+
+    def __getitem__(self, key):
+        if key not in INDICATOR_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        if key not in INDICATOR_FIELDS:
+            return default
+        value = getattr(self, key)
+        return default if value is None else value
+
+    def __iter__(self):
+        return iter(INDICATOR_FIELDS)
+
+    def __len__(self):
+        return len(INDICATOR_FIELDS)
+
+    def __repr__(self):
+        return f"Indicators({self.symbol}, sma={self.sma}, ema={self.ema}, rsi={self.rsi})"
+
+
+class _Series:
+    """Buffers e somas correntes de um símbolo; cada tick custa O(1)."""
+
+    __slots__ = ("prices", "returns", "pv", "volumes",
+                 "sum_p", "sum_r", "sum_r2", "sum_pv", "sum_v",
+                 "ema", "avg_gain", "avg_loss", "changes",
+                 "last_price", "last_volume", "ticks", "result")
+
+    def __init__(self, window):
+        self.prices = RingBuffer(window)
+        self.returns = RingBuffer(window)
+        self.pv = RingBuffer(window)
+        self.volumes = RingBuffer(window)
+        self.sum_p = self.sum_r = self.sum_r2 = self.sum_pv = self.sum_v = 0.0
+        self.ema = None
+        self.avg_gain = self.avg_loss = 0.0
+        self.changes = 0
+        self.last_price = None
+        self.last_volume = None
+        self.ticks = 0
+        self.result = None
+
+    def load(self, prices, window):
+        # estado equivalente a ter passado `prices` (> 0, sem volume) por _push, exceto EMA/RSI
+        self.prices.extend(prices)
+        self.returns.extend(np.log(prices[1:] / prices[:-1]))
+        zeros = np.zeros(min(len(prices), window))
+        self.volumes.extend(zeros)
+        self.pv.extend(zeros)
+        self.last_price = float(prices[-1])
+        self.changes = len(prices) - 1
+        self.ticks = len(prices)
+
+    def resync(self):
+        # somas exatas a partir dos buffers
+        self.sum_p = float(self.prices.view().sum())
+        r = self.returns.view()
+        self.sum_r = float(r.sum())
+        self.sum_r2 = float((r * r).sum())
+        self.sum_pv = float(self.pv.view().sum())
+        self.sum_v = float(self.volumes.view().sum())
+
+
+class IndicatorEngine:
+    """SMA, EMA, volatilidade, RSI e VWAP por símbolo, mantidos incrementalmente a cada tick.
+
+    `update()` roda na thread do websocket; `get()`/`snapshot()` devolvem registros Indicators
+    já publicados, sem lock. `recompute()` recalcula vários símbolos de uma vez em NumPy.
+    O volume de cada tick é a diferença do volume 24h entre dois ticks (negativos viram 0).
+    """
+
+    def __init__(self, window=INDICATOR_WINDOW, ema_span=EMA_SPAN, rsi_period=RSI_PERIOD):
+        self.window = window
+        self.ema_span = ema_span
+        self.rsi_period = rsi_period
+        self._alpha = 2.0 / (ema_span + 1)
+        self._series = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._series)
+
+    # ----------------------------------------------------
+    # Atualização incremental
+    # ----------------------------------------------------
+
+    def update(self, symbol, metrics):
+        """Handler de tick: update(symbol, MarketRecord)."""
+        price = metrics.price
+        if not price:
+            return None
+        with self._lock:
+            series = self._series.get(symbol)
+            if series is None:
+                series = self._series[symbol] = _Series(self.window)
+            return self._push(symbol, series, price, metrics.volume)
+
+    def _push(self, symbol, s, price, volume):
+        last = s.last_price
+
+        evicted = s.prices.append(price)
+        s.sum_p += price - (evicted if evicted is not None else 0.0)
+
+        # volume negociado desde o tick anterior
+        dv = 0.0
+        if s.last_volume is not None and volume is not None:
+            dv = max(volume - s.last_volume, 0.0)
+        evicted = s.volumes.append(dv)
+        s.sum_v += dv - (evicted if evicted is not None else 0.0)
+        evicted = s.pv.append(price * dv)
+        s.sum_pv += price * dv - (evicted if evicted is not None else 0.0)
+
+        if last is not None and last > 0:
+            r = math.log(price / last)
+            evicted = s.returns.append(r)
+            if evicted is not None:
+                s.sum_r -= evicted
+                s.sum_r2 -= evicted * evicted
+            s.sum_r += r
+            s.sum_r2 += r * r
+
+            # RSI de Wilder: média simples até completar o período, depois suavizada
+            change = price - last
+            s.changes += 1
+            n = min(s.changes, self.rsi_period)
+            s.avg_gain += ((change if change > 0 else 0.0) - s.avg_gain) / n
+            s.avg_loss += ((-change if change < 0 else 0.0) - s.avg_loss) / n
+
+        # EMA: média simples dos primeiros ema_span preços, depois suavização exponencial
+        n = s.ticks + 1
+        k = 1.0 / n if n <= self.ema_span else self._alpha
+        s.ema = price if s.ema is None else s.ema + k * (price - s.ema)
+        s.last_price = price
+        if volume is not None:
+            s.last_volume = volume
+
+        s.ticks += 1
+        if s.ticks % RESYNC_EVERY == 0:
+            s.resync()
+
+        return self._publish(symbol, s)
+
+    def _publish(self, symbol, s):
+        n = len(s.prices)
+        m = len(s.returns)
+        volatility = None
+        if m > 1:
+            var = (s.sum_r2 - s.sum_r * s.sum_r / m) / (m - 1)
+            volatility = math.sqrt(var) * 100 if var > 0 else 0.0
+
+        sma = s.sum_p / n if n else None
+        result = Indicators(
+            symbol, s.ticks,
+            sma=sma,
+            ema=s.ema,
+            volatility=volatility,
+            rsi=_rsi(s.avg_gain, s.avg_loss) if s.changes else None,
+            vwap=s.sum_pv / s.sum_v if s.sum_v > 0 else sma,
+        )
+        s.result = result
+        self._results[symbol] = result
+        return result
+
+    def seed(self, symbol, prices, volumes=None):
+        """Alimenta o histórico de um símbolo (ex: preços salvos) antes dos ticks ao vivo."""
+        with self._lock:
+            series = self._series[symbol] = _Series(self.window)
+            volumes = volumes if volumes is not None else [None] * len(prices)
+            for price, volume in zip(prices, volumes):
+                if price:
+                    self._push(symbol, series, price, volume)
+            return series.result
+
+    def remove(self, symbol):
+        with self._lock:
+            self._series.pop(symbol, None)
+            self._results.pop(symbol, None)
+
+    # ----------------------------------------------------
+    # Recálculo em lote (todos os símbolos de uma vez)
+    # ----------------------------------------------------
+
+    def recompute(self, histories=None):
+        """Recalcula os indicadores de vários símbolos de uma vez, vetorizado sobre os símbolos.
+
+        Com `histories` ({symbol: preços em ordem cronológica}, ex: depois de um snapshot ou de
+        MarketState.restore()), os buffers desses símbolos são refeitos a partir dos preços; sem
+        ele, todos os símbolos são recalculados a partir dos buffers atuais. O resultado é o
+        mesmo de passar cada preço por update(); EMA e RSI só são refeitos quando a série
+        inteira está disponível, senão o estado incremental é mantido.
+        """
+        with self._lock:
+            names, series, full = [], [], []
+            if histories is not None:
+                for symbol, prices in histories.items():
+                    prices = np.asarray(prices, dtype=np.float64)
+                    prices = prices[prices > 0]
+                    if not len(prices):
+                        continue
+                    s = self._series[symbol] = _Series(self.window)
+                    s.load(prices, self.window)
+                    names.append(symbol)
+                    series.append(s)
+                    full.append(prices)
+            else:
+                for symbol, s in self._series.items():
+                    names.append(symbol)
+                    series.append(s)
+                    # o buffer ainda guarda a série desde o primeiro tick?
+                    full.append(s.prices.view() if s.ticks == len(s.prices) else None)
+            if not names:
+                return {}
+
+            # somas da janela a partir dos buffers
+            prices = _matrix([s.prices.view() for s in series])
+            returns = _matrix([s.returns.view() for s in series])
+            sum_p = np.nansum(prices, axis=1)
+            sum_r = np.nansum(returns, axis=1)
+            sum_r2 = np.nansum(returns * returns, axis=1)
+            sum_pv = np.nansum(_matrix([s.pv.view() for s in series]), axis=1)
+            sum_v = np.nansum(_matrix([s.volumes.view() for s in series]), axis=1)
+
+            # EMA e RSI percorrendo a série inteira, como em _push
+            rows = [i for i, f in enumerate(full) if f is not None]
+            if rows:
+                ema, avg_gain, avg_loss = _recurrences(
+                    _matrix([full[i] for i in rows]), self._alpha, self.ema_span, self.rsi_period)
+                for j, i in enumerate(rows):
+                    s = series[i]
+                    s.ema = float(ema[j])
+                    s.avg_gain = float(avg_gain[j])
+                    s.avg_loss = float(avg_loss[j])
+
+            results = {}
+            for i, (symbol, s) in enumerate(zip(names, series)):
+                s.sum_p = float(sum_p[i])
+                s.sum_r = float(sum_r[i])
+                s.sum_r2 = float(sum_r2[i])
+                s.sum_pv = float(sum_pv[i])
+                s.sum_v = float(sum_v[i])
+                results[symbol] = self._publish(symbol, s)
+            return results
+
+    # ----------------------------------------------------
+    # Leitura (sem lock)
+    # ----------------------------------------------------
+
+    def get(self, symbol, default=None):
+        return self._results.get(symbol, default)
+
+    def snapshot(self):
+        return self._results.copy()
+
+    def column(self, field, symbols):
+        """Um indicador para vários símbolos como array NumPy (NaN onde não há valor)."""
+        results = self._results
+        out = np.full(len(symbols), np.nan)
+        for i, symbol in enumerate(symbols):
+            r = results.get(symbol)
+            value = getattr(r, field) if r is not None else None
+            if value is not None:
+                out[i] = value
+        return out
+
+
+# ----------------------------------------------------
+# Auxiliares
+# ----------------------------------------------------
+
+def _rsi(avg_gain, avg_loss):
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+def _matrix(rows):
+    # uma linha por símbolo, alinhada à esquerda (mais antigo na coluna 0), NaN onde falta
+    width = max(max((len(r) for r in rows), default=0), 1)
+    out = np.full((len(rows), width), np.nan)
+    for i, r in enumerate(rows):
+        out[i, :len(r)] = r
+    return out
+
+
+def _recurrences(prices, alpha, span, period):
+    # EMA (semeada pela SMA dos primeiros `span` preços) e médias de Wilder (semeadas pela média
+    # simples das primeiras `period` variações), coluna a coluna: mesmas contas de _push
+    ema = prices[:, 0].copy()
+    avg_gain = np.zeros(len(prices))
+    avg_loss = np.zeros(len(prices))
+    for t in range(1, prices.shape[1]):
+        col = prices[:, t]
+        valid = ~np.isnan(col)
+        k = 1.0 / (t + 1) if t + 1 <= span else alpha
+        ema = np.where(valid, ema + k * (col - ema), ema)
+        delta = np.where(valid, col - prices[:, t - 1], 0.0)
+        n = min(t, period)
+        avg_gain = np.where(valid, avg_gain + (np.maximum(delta, 0.0) - avg_gain) / n, avg_gain)
+        avg_loss = np.where(valid, avg_loss + (np.maximum(-delta, 0.0) - avg_loss) / n, avg_loss)
+    return ema, avg_gain, avg_loss
@@ -0,0 +1,207 @@
+# core/klines.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+KLINE_CACHE_DIR = os.path.join(RESOURCES_DIR, "klines")
+
+BINANCE_REST_URL = "https://api.binance.com"
+KLINES_PATH = "/api/v3/klines"
+
+REQUEST_TIMEOUT = 10      # segundos
+MAX_LIMIT = 1000          # máximo de candles por requisição na Binance
+MAX_CACHED = 1000         # candles mantidos por (símbolo, intervalo)
+
+INTERVAL_MS = {
+    "1m": 60_000, "3m": 180_000, "5m": 300_000, "15m": 900_000, "30m": 1_800_000,
+    "1h": 3_600_000, "2h": 7_200_000, "4h": 14_400_000, "1d": 86_400_000,
+}
+
+
+class HttpTransport:
+    """Transporte padrão: uma requests.Session por thread, reaproveitando a conexão entre chamadas.
+
+    requests.Session não é thread-safe, e o KlineLoader chama o transporte de várias threads.
+    """
+
+    def __init__(self, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        self._local = threading.local()
+        self._sessions = []
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+            with self._lock:
+                self._sessions.append(session)
+        return session
+
+    def __call__(self, url, params):
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        return response.json()
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+
+
+class KlineCache:
+    """Cache de candles em memória e em disco, por (símbolo, intervalo)."""
+
+    def __init__(self, directory=KLINE_CACHE_DIR, max_candles=MAX_CACHED):
+        self.directory = directory
+        self.max_candles = max_candles
+        self._memory = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, symbol, interval):
+        key = (symbol, interval)
+        with self._lock:
+            candles = self._memory.get(key)
+        if candles is not None:
+            return candles
+
+        try:
+            with open(self._path(symbol, interval), "r", encoding="utf-8") as f:
+                candles = json.load(f)
+        except Exception:
+            candles = []
+
+        with self._lock:
+            self._memory[key] = candles
+        return candles
+
+    def put(self, symbol, interval, candles):
+        candles = candles[-self.max_candles:]
+        with self._lock:
+            self._memory[(symbol, interval)] = candles
+        try:
+            tmp = self._path(symbol, interval) + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(candles, f)
+            os.replace(tmp, self._path(symbol, interval))
+        except OSError as e:
+            print("Erro ao salvar cache de klines:", e)
+        return candles
+
+    def _path(self, symbol, interval):
+        return os.path.join(self.directory, f"{symbol}_{interval}.json")
+
+
+class KlineLoader:
+    """Busca klines fora da thread da GUI, baixando só os candles que faltam no cache.
+
+    Com `engine` (AsyncMarketEngine), as requisições rodam como corrotinas no event loop do
+    motor, pela mesma sessão aiohttp; sem ele, num pool de threads com `transport`.
+    """
+
+    def __init__(self, base_url=BINANCE_REST_URL, transport=None, cache=None, max_workers=2,
+                 engine=None):
+        self.url = base_url.rstrip("/") + KLINES_PATH
+        self._transport = transport
+        self._transport_lock = threading.Lock()
+        self.cache = cache or KlineCache()
+        self.engine = engine
+        self.max_workers = max_workers
+        self._executor = None
+
+    @property
+    def transport(self):
+        # criado sob demanda para não importar requests na inicialização
+        with self._transport_lock:
+            if self._transport is None:
+                self._transport = HttpTransport()
+            return self._transport
+
+    def cached(self, symbol, interval="1m"):
+        return self.cache.get(symbol, interval)
+
+    def fetch(self, symbol, interval="1m", limit=120, callback=None):
+        """Agenda a atualização; callback(symbol, interval, candles) roda na thread do pool
+        (ou do event loop do motor)."""
+        if self.engine is not None:
+            async def task():
+                candles = await self.update_async(symbol, interval, limit)
+                if callback:
+                    callback(symbol, interval, candles)
+                return candles
+            try:
+                return self.engine.submit(task())
+            except RuntimeError:
+                pass   # motor ainda não iniciado (ou já parado): vai pelo pool
+
+        def job():
+            candles = self.update(symbol, interval, limit)
+            if callback:
+                callback(symbol, interval, candles)
+            return candles
+        with self._transport_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="klines")
+            return self._executor.submit(job)
+
+    def update(self, symbol, interval="1m", limit=120):
+        cached, params, fresh = self._request(symbol, interval, limit)
+        try:
+            data = self.transport(self.url, params)
+        except Exception as e:
+            print("Erro ao buscar klines:", e)
+            return cached
+        return self._merge(symbol, interval, cached, data, fresh)
+
+    async def update_async(self, symbol, interval="1m", limit=120):
+        cached, params, fresh = self._request(symbol, interval, limit)
+        try:
+            data = await self.engine.get_json(self.url, params)
+        except Exception as e:
+            print("Erro ao buscar klines:", e)
+            return cached
+        return self._merge(symbol, interval, cached, data, fresh)
+
+    def _request(self, symbol, interval, limit):
+        # (candles em cache, parâmetros da requisição, se o cache continua valendo para o merge)
+        cached = self.cache.get(symbol, interval)
+        step = INTERVAL_MS.get(interval, 60_000)
+        now_ms = int(time.time() * 1000)
+
+        params = {"symbol": symbol, "interval": interval}
+        fresh = bool(cached) and now_ms - cached[-1][0] < MAX_LIMIT * step
+        if fresh:
+            # só o que falta: a partir do último candle (que pode ainda estar aberto)
+            params["startTime"] = cached[-1][0]
+            params["limit"] = MAX_LIMIT
+        else:
+            params["limit"] = limit
+        return cached, params, fresh
+
+    def _merge(self, symbol, interval, cached, data, fresh):
+        # em caso de erro o cache antigo (mesmo vencido) ainda é melhor que nada
+        if isinstance(data, dict) and "code" in data:
+            print("Erro Binance API:", data)
+            return cached
+        if not data:
+            return cached
+
+        # cache vencido não emenda com os candles novos: ficaria um buraco no meio
+        first_new = data[0][0]
+        merged = [c for c in cached if c[0] < first_new] + data if fresh else data
+        return self.cache.put(symbol, interval, merged)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        if isinstance(self._transport, HttpTransport):
+            self._transport.close()
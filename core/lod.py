@@ -0,0 +1,128 @@
+# core/lod.py
+"""Níveis de detalhe para gráficos longos: pirâmides de decimação pré-calculadas.
+
+Cada nível agrupa FACTOR pontos do nível anterior. Para linhas, cada grupo guarda o mínimo e
+o máximo (com a posição x de cada um), então picos nunca somem; para candles, cada grupo vira
+um candle OHLC. `select(x0, x1, max_points)` escolhe o nível mais fino que cabe no número de
+pontos pedido e devolve só a fatia visível, então o custo de desenho independe do tamanho
+da série.
+"""
+import numpy as np
+
+FACTOR = 4            # pontos do nível anterior por grupo
+MIN_LEVEL_SIZE = 32   # não cria níveis com menos grupos que isso
+MAX_POINTS = 2000     # pontos desenhados quando o chamador não informa
+
+
+def _grouped(a, factor):
+    # completa o último grupo repetindo o último valor (não altera mínimo, máximo nem fechamento)
+    n = len(a)
+    groups = -(-n // factor)
+    pad = groups * factor - n
+    if pad:
+        a = np.concatenate([a, np.repeat(a[-1:], pad)])
+    return a.reshape(groups, factor)
+
+
+def _visible(start_x, x0, x1, margin=1):
+    # índices [i0, i1) dos grupos que tocam [x0, x1], com um grupo de folga de cada lado
+    n = len(start_x)
+    i0 = 0 if x0 is None else max(int(np.searchsorted(start_x, x0, "right")) - 1 - margin, 0)
+    i1 = n if x1 is None else min(int(np.searchsorted(start_x, x1, "right")) + margin, n)
+    return i0, max(i1, i0)
+
+
+class LodPyramid:
+    """Pirâmide min/max de uma série (x crescente, y)."""
+
+    def __init__(self, x, y, factor=FACTOR, min_level_size=MIN_LEVEL_SIZE):
+        self.factor = factor
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        self.x = x
+        self.y = y
+
+        # nível k: (x inicial do grupo, x do mínimo, mínimo, x do máximo, máximo)
+        self.levels = []
+        start, lo_x, lo_y, hi_x, hi_y = x, x, y, x, y
+        while len(lo_y) > min_level_size * factor:
+            rows = np.arange(-(-len(lo_y) // factor))
+            ly, hy = _grouped(lo_y, factor), _grouped(hi_y, factor)
+            i, j = ly.argmin(axis=1), hy.argmax(axis=1)
+            lo_x = _grouped(lo_x, factor)[rows, i]
+            hi_x = _grouped(hi_x, factor)[rows, j]
+            lo_y, hi_y = ly[rows, i], hy[rows, j]
+            start = start[::factor]
+            self.levels.append((start, lo_x, lo_y, hi_x, hi_y))
+
+    def __len__(self):
+        return len(self.y)
+
+    def level_for(self, x0=None, x1=None, max_points=MAX_POINTS):
+        """0 = série original; k = k-ésimo nível decimado."""
+        i0, i1 = _visible(self.x, x0, x1)
+        if i1 - i0 <= max_points:
+            return 0
+        for k, (start, *_rest) in enumerate(self.levels, 1):
+            i0, i1 = _visible(start, x0, x1)
+            if 2 * (i1 - i0) <= max_points:
+                return k
+        return len(self.levels)
+
+    def select(self, x0=None, x1=None, max_points=MAX_POINTS):
+        """(x, y) da faixa visível com no máximo ~max_points pontos."""
+        level = self.level_for(x0, x1, max_points)
+        if level == 0:
+            i0, i1 = _visible(self.x, x0, x1)
+            return self.x[i0:i1], self.y[i0:i1]
+
+        start, lo_x, lo_y, hi_x, hi_y = self.levels[level - 1]
+        i0, i1 = _visible(start, x0, x1)
+        lo_x, lo_y, hi_x, hi_y = lo_x[i0:i1], lo_y[i0:i1], hi_x[i0:i1], hi_y[i0:i1]
+
+        # dois pontos por grupo, na ordem em que aconteceram
+        low_first = lo_x <= hi_x
+        xs = np.empty(2 * len(lo_x))
+        ys = np.empty(2 * len(lo_x))
+        xs[0::2] = np.where(low_first, lo_x, hi_x)
+        ys[0::2] = np.where(low_first, lo_y, hi_y)
+        xs[1::2] = np.where(low_first, hi_x, lo_x)
+        ys[1::2] = np.where(low_first, hi_y, lo_y)
+        return xs, ys
+
+
+class OhlcPyramid:
+    """Pirâmide de candles: cada grupo vira (abertura, máxima, mínima, fechamento)."""
+
+    def __init__(self, x, open_, high, low, close, factor=FACTOR, min_level_size=MIN_LEVEL_SIZE):
+        self.factor = factor
+        level = tuple(np.ascontiguousarray(a, dtype=np.float64) for a in (x, open_, high, low, close))
+        self.levels = [level]
+        while len(level[0]) > min_level_size * factor:
+            x, o, h, l, c = level
+            level = (
+                x[::factor],
+                o[::factor],
+                _grouped(h, factor).max(axis=1),
+                _grouped(l, factor).min(axis=1),
+                _grouped(c, factor)[:, -1],
+            )
+            self.levels.append(level)
+
+    def __len__(self):
+        return len(self.levels[0][0])
+
+    def level_for(self, x0=None, x1=None, max_candles=MAX_POINTS // 4):
+        for k, level in enumerate(self.levels):
+            i0, i1 = _visible(level[0], x0, x1)
+            if i1 - i0 <= max_candles:
+                return k
+        return len(self.levels) - 1
+
+    def select(self, x0=None, x1=None, max_candles=MAX_POINTS // 4):
+        """(x, open, high, low, close, largura do grupo em unidades de x) da faixa visível."""
+        level = self.level_for(x0, x1, max_candles)
+        x = self.levels[level][0]
+        i0, i1 = _visible(x, x0, x1)
+        width = float(np.median(np.diff(x))) if len(x) > 1 else 1.0
+        return tuple(a[i0:i1] for a in self.levels[level]) + (width,)
@@ -0,0 +1,202 @@
+# core/market_state.py
+
+import threading
+from collections import deque
+from collections.abc import Mapping
+
+HISTORY_LEN = 200
+CHANGE_LOG_LEN = 100_000   # alterações guardadas para changed_since(); metade é descartada ao encher
+
+RECORD_FIELDS = ("price", "open_price", "price_change_percent",
+                 "high_price", "low_price", "volume", "trend")
+_ALIASES = {"last_price": "price"}   # chave antiga do data_state, duplicava "price"
+_KEYS = RECORD_FIELDS + tuple(_ALIASES)
+
+
+class MarketRecord(Mapping):
+    """Registro compacto de um símbolo (__slots__), com leitura compatível com o antigo dict.
+
+    `rec.price` é o acesso rápido; `rec["price"]`, `rec.get("last_price")`, `dict(rec)` etc.
+    continuam funcionando para o código que ainda trata o registro como dict.
+    """
+
+    __slots__ = ("symbol",) + RECORD_FIELDS
+
+    def __init__(self, symbol, price=0.0, open_price=0.0, price_change_percent=0.0,
+                 high_price=0.0, low_price=0.0, volume=0.0, trend="flat"):
+        self.symbol = symbol
+        self.price = price
+        self.open_price = open_price
+        self.price_change_percent = price_change_percent
+        self.high_price = high_price
+        self.low_price = low_price
+        self.volume = volume
+        self.trend = trend
+
+    def copy(self):
+        return MarketRecord(self.symbol, self.price, self.open_price, self.price_change_percent,
+                            self.high_price, self.low_price, self.volume, self.trend)
+
+    def as_row(self):
+        # ordem das colunas numéricas da tabela
+        return (self.price, self.price_change_percent, self.volume, self.high_price, self.low_price)
+
+    # ----------------------------------------------------
+    # Leitura estilo dict
+    # ----------------------------------------------------
+
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, _ALIASES.get(key, key))
+
+    def get(self, key, default=None):
+        if key not in _KEYS:
+            return default
+        return getattr(self, _ALIASES.get(key, key))
+
+    def __iter__(self):
+        return iter(_KEYS)
+
+    def __len__(self):
+        return len(_KEYS)
+
+    def __repr__(self):
+        return f"MarketRecord({self.symbol}, price={self.price}, pct={self.price_change_percent})"
+
+
+class MarketState:
+    """Estado de mercado versionado de uma instância do worker.
+
+    Cada registro publicado é um MarketRecord novo que nunca mais é alterado, então leitores
+    pegam `snapshot()` ou `get()` sem lock e sem bloquear o websocket. Cada escrita
+    incrementa `version`; `changed_since(v)` devolve só o que mudou depois de `v`.
+    """
+
+    def __init__(self, history_len=HISTORY_LEN):
+        self.history_len = history_len
+        self._records = {}    # symbol -> MarketRecord imutável
+        self._versions = {}   # symbol -> versão da última alteração
+        self._history = {}    # symbol -> deque de preços
+        self._version = 0
+        # log de alterações: (versão base, [símbolo da versão base+1, base+2, ...]); a tupla é
+        # trocada inteira ao compactar, então o leitor sempre vê um par consistente
+        self._log = (0, [])
+        self._write_lock = threading.Lock()   # só entre escritores (REST inicial x websocket)
+
+    @property
+    def version(self):
+        return self._version
+
+    # ----------------------------------------------------
+    # Escrita
+    # ----------------------------------------------------
+
+    def publish(self, record):
+        """Publica um registro novo (o chamador não deve mais alterá-lo)."""
+        symbol = record.symbol
+        with self._write_lock:
+            history = self._history.get(symbol)
+            if history is None:
+                history = self._history[symbol] = deque(maxlen=self.history_len)
+            history.append(record.price)
+            self._commit(record)
+            self._trim_log()
+        return record
+
+    def publish_many(self, records):
+        """Publica um lote (ex: frame !miniTicker@arr) com uma só aquisição do lock."""
+        with self._write_lock:
+            histories = self._history
+            for record in records:
+                symbol = record.symbol
+                history = histories.get(symbol)
+                if history is None:
+                    history = histories[symbol] = deque(maxlen=self.history_len)
+                history.append(record.price)
+                self._commit(record)
+            self._trim_log()
+
+    def restore(self, items):
+        """Carrega pares (registro, histórico de preços) de um snapshot salvo (core/snapshot.py)."""
+        with self._write_lock:
+            for record, prices in items:
+                symbol = record.symbol
+                history = self._history[symbol] = deque(maxlen=self.history_len)
+                history.extend(float(p) for p in prices[-self.history_len:])
+                self._commit(record)
+            self._trim_log()
+
+    def _commit(self, record):
+        # com _write_lock. Ordem: registro e versão, depois o log, por último o contador; quem
+        # lê uma versão no log ou em `version` sempre já encontra o registro correspondente
+        symbol = record.symbol
+        version = self._version + 1
+        # publicação: uma única atribuição no dict, atômica para os leitores
+        self._records[symbol] = record
+        self._versions[symbol] = version
+        self._log[1].append(symbol)
+        self._version = version
+
+    def _trim_log(self):
+        base, log = self._log
+        if len(log) > CHANGE_LOG_LEN:
+            keep = CHANGE_LOG_LEN // 2
+            self._log = (base + len(log) - keep, log[-keep:])
+
+    def update(self, symbol, fields):
+        old = self._records.get(symbol)
+        record = old.copy() if old else MarketRecord(symbol)
+        for key, value in fields.items():
+            key = _ALIASES.get(key, key)
+            if key in RECORD_FIELDS:
+                setattr(record, key, value)
+        return self.publish(record)
+
+    # ----------------------------------------------------
+    # Leitura (sem lock)
+    # ----------------------------------------------------
+
+    def get(self, symbol, default=None):
+        return self._records.get(symbol, default)
+
+    def __contains__(self, symbol):
+        return symbol in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def symbols(self):
+        return list(self._records)
+
+    def snapshot(self):
+        # a cópia de um dict é feita de uma vez só sob o GIL: nunca vê um estado pela metade
+        return self._records.copy()
+
+    def changed_since(self, version):
+        """Retorna (versão_atual, {symbol: registro}) com o que mudou depois de `version`.
+
+        Custa O(alterações) pelo log; só quando `version` já saiu do log cai numa varredura
+        de todos os símbolos.
+        """
+        base, log = self._log
+        if version >= base:
+            # fatia do log: cópia atômica; a versão devolvida é a da última entrada lida
+            changed = log[version - base:]
+            get = self._records.get
+            return version + len(changed), {s: get(s) for s in changed}
+
+        # versões copiadas primeiro: a versão devolvida sai da própria cópia, nunca à frente dela
+        versions = self._versions.copy()
+        current = max(versions.values(), default=version)
+        get = self._records.get
+        return current, {s: get(s) for s, v in versions.items() if v > version}
+
+    def history(self, symbol):
+        h = self._history.get(symbol)
+        return list(h) if h else []
+
+    def histories(self):
+        """Cópia de todos os históricos ({symbol: [preços]}), para o snapshot em disco."""
+        with self._write_lock:
+            return {symbol: list(h) for symbol, h in self._history.items()}
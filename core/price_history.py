@@ -0,0 +1,200 @@
+# core/price_history.py
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+PRICE_HISTORY_DIR = os.path.join(RESOURCES_DIR, "price_history")
+LEGACY_PRICE_HISTORY_FILE = os.path.join(RESOURCES_DIR, "price_history.json")
+
+HISTORY_LEN = 200        # quantos preços o leitor enxerga por símbolo
+COMPACT_FACTOR = 4       # compacta quando o arquivo passa de HISTORY_LEN * COMPACT_FACTOR linhas
+TAIL_BLOCK = 4096
+MAX_OPEN_FILES = 64      # arquivos mantidos abertos (LRU); o mercado completo tem 400+ símbolos
+
+
+class PriceHistoryStore:
+    """Histórico de preços append-only: um arquivo de uma linha por preço para cada símbolo."""
+
+    def __init__(self, directory=PRICE_HISTORY_DIR, max_len=HISTORY_LEN,
+                 compact_factor=COMPACT_FACTOR, legacy_file=LEGACY_PRICE_HISTORY_FILE,
+                 max_open=MAX_OPEN_FILES):
+        self.directory = directory
+        self.max_len = max_len
+        self.compact_limit = max_len * compact_factor
+        self.max_open = max_open
+        self._handles = OrderedDict()   # symbol -> arquivo aberto, do menos ao mais recente
+        self._counts = {}
+        self._lock = threading.Lock()
+
+        first_run = not os.path.isdir(directory)
+        os.makedirs(directory, exist_ok=True)
+        if first_run and legacy_file:
+            self._import_legacy(legacy_file)
+
+    # ----------------------------------------------------
+    # Escrita
+    # ----------------------------------------------------
+
+    def append(self, symbol, price):
+        with self._lock:
+            self._append(symbol, price)
+            handle = self._handles.get(symbol)
+            if handle:
+                handle.flush()
+
+    def append_many(self, data_state):
+        with self._lock:
+            touched = []
+            for sym, metrics in data_state.items():
+                price = metrics.get("price")
+                if price is None:
+                    continue
+                self._append(sym, price)
+                touched.append(sym)
+            for sym in touched:
+                handle = self._handles.get(sym)
+                if handle:
+                    handle.flush()
+
+    def _append(self, symbol, price):
+        handle = self._handles.get(symbol)
+        if handle is None:
+            # abaixo do limite de arquivos do sistema (ulimit -n): fecha o usado há mais tempo
+            while len(self._handles) >= self.max_open:
+                _sym, old = self._handles.popitem(last=False)
+                try:
+                    old.close()
+                except OSError:
+                    pass
+            path = self._path(symbol)
+            if symbol not in self._counts:
+                self._counts[symbol] = self._count_lines(path)
+            handle = open(path, "a", encoding="utf-8")
+            self._handles[symbol] = handle
+        else:
+            self._handles.move_to_end(symbol)
+
+        handle.write(f"{float(price)!r}\n")
+        self._counts[symbol] += 1
+
+        if self._counts[symbol] > self.compact_limit:
+            self._compact(symbol)
+
+    # ----------------------------------------------------
+    # Leitura — apenas o final do arquivo
+    # ----------------------------------------------------
+
+    def tail(self, symbol, n=None):
+        n = n or self.max_len
+        with self._lock:
+            handle = self._handles.get(symbol)
+            if handle:
+                handle.flush()
+            return self._read_tail(self._path(symbol), n)
+
+    def symbols(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(n[:-4] for n in names if n.endswith(".log"))
+
+    def _read_tail(self, path, n):
+        return _read_tail(path, n)
+
+    # ----------------------------------------------------
+    # Compactação
+    # ----------------------------------------------------
+
+    def compact(self, symbol=None):
+        with self._lock:
+            targets = [symbol] if symbol else list(self._handles)
+            for sym in targets:
+                self._compact(sym)
+
+    def _compact(self, symbol):
+        path = self._path(symbol)
+        handle = self._handles.pop(symbol, None)
+        if handle:
+            handle.close()
+
+        keep = self._read_tail(path, self.max_len)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(f"{v!r}\n" for v in keep)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("Erro ao compactar histórico de preços:", e)
+        self._counts[symbol] = len(keep)
+
+    def close(self):
+        with self._lock:
+            for handle in self._handles.values():
+                try:
+                    handle.close()
+                except OSError:
+                    pass
+            self._handles.clear()
+
+    # ----------------------------------------------------
+    # Auxiliares
+    # ----------------------------------------------------
+
+    def _path(self, symbol):
+        return os.path.join(self.directory, f"{symbol}.log")
+
+    @staticmethod
+    def _count_lines(path):
+        try:
+            with open(path, "rb") as f:
+                return f.read().count(b"\n")
+        except OSError:
+            return 0
+
+    def _import_legacy(self, legacy_file):
+        # migra o antigo price_history.json (um único documento) para os arquivos por símbolo
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except Exception:
+            return
+
+        for sym, series in legacy.items():
+            try:
+                with open(self._path(sym), "w", encoding="utf-8") as f:
+                    f.writelines(f"{float(v)!r}\n" for v in series[-self.max_len:])
+            except (OSError, TypeError, ValueError) as e:
+                print("Erro ao migrar histórico de preços:", e)
+
+
+def read_tail(symbol, n=HISTORY_LEN, directory=PRICE_HISTORY_DIR):
+    """Últimos `n` preços de um símbolo, só leitura (não cria diretório nem migra nada)."""
+    return _read_tail(os.path.join(directory, f"{symbol}.log"), n)
+
+
+def _read_tail(path, n):
+    try:
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pos = f.tell()
+            data = b""
+            while pos > 0 and data.count(b"\n") <= n:
+                step = min(TAIL_BLOCK, pos)
+                pos -= step
+                f.seek(pos)
+                data = f.read(step) + data
+    except OSError:
+        return []
+
+    values = []
+    for line in data.splitlines()[-n:]:
+        try:
+            values.append(float(line))
+        except ValueError:
+            continue
+    return values
@@ -0,0 +1,336 @@
+# core/recorder.py
+"""Gravação e reprodução de frames brutos do websocket.
+
+Formato: gzip em modo append ("ab"); cada sessão vira um membro gzip novo e cada linha é
+`timestamp\\tframe_bruto`. Uma gravação interrompida perde no máximo o último bloco.
+
+Uso:
+    python -m core.recorder record [--out ARQ] [--seconds N] [--full-market]
+    python -m core.recorder replay ARQ [--speed N|max] [--alerts]
+    python -m core.recorder serve ARQ [--speed N|max] [--port 8765] [--loop]
+"""
+import argparse
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+import zlib
+from urllib.parse import urlparse, parse_qs
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+RECORDINGS_DIR = os.path.join(RESOURCES_DIR, "recordings")
+
+FLUSH_INTERVAL = 1.0     # segundos entre escritas do buffer em disco
+REPLAY_PORT = 8765
+MAX_SPEED = 0            # speed=0 (ou None): sem espera entre frames
+
+
+def default_recording_path():
+    return os.path.join(RECORDINGS_DIR, time.strftime("ticks-%Y%m%d-%H%M%S.log.gz"))
+
+
+# ----------------------------------------------------
+# Gravação
+# ----------------------------------------------------
+
+class TickRecorder:
+    """Grava frames brutos com timestamp; `record()` só empilha, uma thread de fundo comprime."""
+
+    def __init__(self, path=None, flush_interval=FLUSH_INTERVAL):
+        self.path = path or default_recording_path()
+        self.flush_interval = flush_interval
+        self.frames = 0
+
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._running = True
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._file = gzip.open(self.path, "ab")
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True, name="tick-recorder")
+        self._thread.start()
+
+    def record(self, raw, ts=None):
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8", "replace")
+        entry = (time.time() if ts is None else ts, raw)
+        with self._lock:
+            self._buffer.append(entry)
+
+    def flush(self):
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        data = "".join(f"{ts:.6f}\t{raw}\n" for ts, raw in batch).encode("utf-8")
+        try:
+            self._file.write(data)
+            self._file.flush()
+            self.frames += len(batch)
+        except (OSError, ValueError) as e:
+            print("Erro ao gravar ticks:", e)
+
+    def _writer_loop(self):
+        while self._running:
+            time.sleep(self.flush_interval)
+            self.flush()
+
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=self.flush_interval + 1)
+        self.flush()
+        try:
+            self._file.close()
+        except OSError:
+            pass
+
+
+def read_recording(path):
+    """Gera (timestamp, frame_bruto) na ordem gravada; tolera o fim truncado de uma sessão."""
+    with gzip.open(path, "rb") as f:
+        try:
+            for line in f:
+                ts, sep, raw = line.rstrip(b"\n").partition(b"\t")
+                if not sep:
+                    continue
+                try:
+                    yield float(ts), raw.decode("utf-8")
+                except ValueError:
+                    continue
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            # processo encerrado no meio de um bloco: o que veio antes continua válido
+            return
+
+
+# ----------------------------------------------------
+# Reprodução
+# ----------------------------------------------------
+
+class ReplayClock:
+    """Relógio da gravação: `clock()` devolve o timestamp do frame sendo reproduzido.
+
+    Passado como `clock` ao AlertManager, janelas, médias, picos de volume e o histórico de
+    preços seguem o tempo gravado, seja qual for a velocidade da reprodução.
+    """
+
+    def __init__(self, start=None):
+        self.now = time.time() if start is None else start
+
+    def __call__(self):
+        return self.now
+
+
+def replay(frames, handler, speed=1.0, stop_event=None, clock=None):
+    """Entrega cada frame a `handler(raw)` respeitando os intervalos gravados / `speed`.
+
+    speed=1 reproduz em tempo real, speed=N é N vezes mais rápido e speed=0 não espera.
+    Com `clock` (ReplayClock), o relógio avança para o timestamp gravado antes de cada frame.
+    Retorna {"frames", "elapsed", "rate"}.
+    """
+    started = time.perf_counter()
+    first_ts = None
+    count = 0
+    for ts, raw in frames:
+        if stop_event is not None and stop_event.is_set():
+            break
+        if speed:
+            if first_ts is None:
+                first_ts = ts
+            delay = (ts - first_ts) / speed - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        if clock is not None:
+            clock.now = ts
+        handler(raw)
+        count += 1
+    elapsed = time.perf_counter() - started
+    return {"frames": count, "elapsed": elapsed, "rate": count / elapsed if elapsed > 0 else 0.0}
+
+
+def replay_into_feed(path, feed, speed=MAX_SPEED, clock=None):
+    """Alimenta o MarketFeed como se os frames viessem do websocket (sem rede)."""
+    return replay(read_recording(path), feed.process_frame, speed, clock=clock)
+
+
+def _stream_of(raw):
+    try:
+        return json.loads(raw).get("stream")
+    except (ValueError, AttributeError):
+        return None
+
+
+class ReplayServer:
+    """Servidor websocket local que imita o endpoint /stream?streams=... da Binance.
+
+    Cada cliente recebe a gravação desde o início, só com os streams que pediu na URL;
+    assim o BinanceWorker(stream_url="ws://127.0.0.1:8765") roda inteiro contra ela.
+    """
+
+    def __init__(self, path, speed=1.0, host="127.0.0.1", port=REPLAY_PORT, loop=False):
+        self.path = path
+        self.speed = speed
+        self.host = host
+        self.port = port
+        self.loop = loop
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    async def _handler(self, ws, path=None):
+        import asyncio
+
+        if path is None:
+            request = getattr(ws, "request", None)
+            path = getattr(request, "path", "") if request is not None else getattr(ws, "path", "")
+        query = parse_qs(urlparse(path).query)
+        wanted = set("/".join(query.get("streams", [])).split("/")) - {""}
+
+        async def ignore_incoming():
+            # SUBSCRIBE/UNSUBSCRIBE do cliente: confirmados e ignorados
+            async for msg in ws:
+                try:
+                    request_id = json.loads(msg).get("id")
+                except (ValueError, AttributeError):
+                    continue
+                await ws.send(json.dumps({"result": None, "id": request_id}))
+
+        reader = asyncio.ensure_future(ignore_incoming())
+        try:
+            while True:
+                started = time.perf_counter()
+                first_ts = None
+                for ts, raw in read_recording(self.path):
+                    if wanted and _stream_of(raw) not in wanted:
+                        continue
+                    if self.speed:
+                        if first_ts is None:
+                            first_ts = ts
+                        delay = (ts - first_ts) / self.speed - (time.perf_counter() - started)
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    await ws.send(raw)
+                if not self.loop:
+                    break
+        except Exception as e:
+            print("Replay encerrado:", e)
+        finally:
+            reader.cancel()
+
+    async def serve_forever(self):
+        import asyncio
+        import websockets
+
+        async with websockets.serve(self._handler, self.host, self.port, max_size=None):
+            print(f"Reproduzindo {self.path} em {self.url}")
+            await asyncio.Future()
+
+    def run(self):
+        import asyncio
+        asyncio.run(self.serve_forever())
+
+
+# ----------------------------------------------------
+# CLI
+# ----------------------------------------------------
+
+def _parse_speed(text):
+    return MAX_SPEED if text in ("max", "0") else float(text)
+
+
+def _cmd_record(args):
+    from core.connections import ConnectionManager, STREAM_URL
+    from core.utils import POPULAR_NAMES
+
+    recorder = TickRecorder(args.out)
+    manager = ConnectionManager(lambda ws, msg: recorder.record(msg), base_url=STREAM_URL)
+    if args.full_market:
+        manager.add_streams(["!miniTicker@arr"])
+    else:
+        manager.add_symbols([f"{s}USDT" for s in POPULAR_NAMES])
+
+    print(f"Gravando em {recorder.path} (Ctrl+C para parar)")
+    try:
+        deadline = time.monotonic() + args.seconds if args.seconds else None
+        while deadline is None or time.monotonic() < deadline:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.stop()
+        recorder.close()
+    print(f"{recorder.frames} frames gravados")
+
+
+def _cmd_replay(args):
+    from core.feed import MarketFeed, ENGINE_ASYNC
+
+    # mesmo caminho do websocket: decodificação, estado, indicadores e (opcional) alertas;
+    # motor async só para não criar o cliente REST (run() nunca é chamado)
+    # sem snapshot nem banco de séries: a reprodução não mexe nos dados do app
+    feed = MarketFeed(engine=ENGINE_ASYNC, full_market=args.full_market,
+                      snapshot_file=None, tsdb_file=None)
+    clock = ReplayClock()
+    scratch = manager = None
+    if args.alerts:
+        import tempfile
+        from core.alerts import AlertManager, ALERT_FILE
+
+        # alertas reais copiados para um diretório temporário: disparos não mexem nos arquivos do app;
+        # avaliados no tempo gravado, não no relógio de parede
+        scratch = tempfile.mkdtemp(prefix="replay-")
+        if os.path.exists(ALERT_FILE):
+            shutil.copy(ALERT_FILE, scratch)
+        manager = AlertManager(resources_dir=scratch, clock=clock)
+        manager.add_listener(lambda kind, title, msg: None)
+        manager.attach_indicators(feed.indicators)
+        feed.add_tick_handler(manager.process_tick)
+
+    try:
+        stats = replay_into_feed(args.path, feed, _parse_speed(args.speed), clock=clock)
+        print(f"{stats['frames']} frames em {stats['elapsed']:.3f}s "
+              f"({stats['rate']:,.0f} frames/s) · {len(feed.state)} símbolos")
+    finally:
+        if manager is not None:
+            manager.close()
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def _cmd_serve(args):
+    ReplayServer(args.path, speed=_parse_speed(args.speed), port=args.port, loop=args.loop).run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m core.recorder", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("record", help="grava os streams ao vivo")
+    p.add_argument("--out", help="arquivo .log.gz (padrão: resources/recordings/ticks-<data>.log.gz)")
+    p.add_argument("--seconds", type=float, default=0, help="duração (0 = até Ctrl+C)")
+    p.add_argument("--full-market", action="store_true", help="grava !miniTicker@arr")
+    p.set_defaults(func=_cmd_record)
+
+    p = sub.add_parser("replay", help="alimenta o MarketFeed com uma gravação, sem rede")
+    p.add_argument("path")
+    p.add_argument("--speed", default="max", help="1 = tempo real, N = N× mais rápido, max = sem espera")
+    p.add_argument("--alerts", action="store_true", help="inclui AlertManager.process_tick")
+    p.add_argument("--full-market", action="store_true", help="gravação de !miniTicker@arr")
+    p.set_defaults(func=_cmd_replay)
+
+    p = sub.add_parser("serve", help="servidor websocket local com a gravação")
+    p.add_argument("path")
+    p.add_argument("--speed", default="1")
+    p.add_argument("--port", type=int, default=REPLAY_PORT)
+    p.add_argument("--loop", action="store_true", help="recomeça ao chegar no fim")
+    p.set_defaults(func=_cmd_serve)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
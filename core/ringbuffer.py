@@ -0,0 +1,49 @@
+# core/ringbuffer.py
+
+import numpy as np
+
+
+class RingBuffer:
+    """Buffer circular pré-alocado em NumPy.
+
+    Cada valor é gravado em duas posições (i e i + capacity), então `view()` sempre devolve
+    uma fatia contígua, em ordem cronológica, sem copiar nem alocar.
+    """
+
+    def __init__(self, capacity, dtype=np.float64):
+        self.capacity = capacity
+        self._buf = np.zeros(2 * capacity, dtype=dtype)
+        self._pos = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, value):
+        """Grava `value`; devolve o valor descartado quando o buffer já estava cheio."""
+        i = self._pos
+        evicted = self._buf[i] if self._size == self.capacity else None
+        self._buf[i] = value
+        self._buf[i + self.capacity] = value
+        self._pos = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return evicted
+
+    def extend(self, values):
+        # só os últimos `capacity` valores sobrevivem
+        for v in values[-self.capacity:]:
+            self.append(v)
+
+    def view(self):
+        start = (self._pos - self._size) % self.capacity
+        return self._buf[start:start + self._size]
+
+    def last(self, default=None):
+        if not self._size:
+            return default
+        return self._buf[(self._pos - 1) % self.capacity]
+
+    def clear(self):
+        self._pos = 0
+        self._size = 0
@@ -0,0 +1,145 @@
+# core/sinks.py
+"""Destinos de notificação para o modo headless.
+
+Cada sink é um callable `sink(kind, title, message)`, o mesmo formato de
+AlertManager.add_listener. Ele roda na thread do websocket, então o que pode
+demorar (arquivo, HTTP) vai para uma fila com uma thread de fundo.
+
+Para testar o webhook sem um servidor de verdade:
+    python -m core.sinks --port 8787     # imprime cada POST recebido
+"""
+import abc
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.request
+
+WEBHOOK_TIMEOUT = 5
+WEBHOOK_PORT = 8787
+
+
+def _payload(kind, title, message):
+    return {"time": time.time(), "kind": kind, "title": title, "message": message}
+
+
+class StdoutSink:
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def __call__(self, kind, title, message):
+        stamp = time.strftime("%H:%M:%S")
+        print(f"[{stamp}] {title}: {message}", file=self.stream, flush=True)
+
+    def close(self):
+        pass
+
+
+class _QueuedSink(abc.ABC):
+    """Base: entrega em segundo plano para não bloquear o tick."""
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name=type(self).__name__)
+        self._thread.start()
+
+    def __call__(self, kind, title, message):
+        self._queue.put(_payload(kind, title, message))
+
+    def _loop(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            try:
+                self.deliver(item)
+            except Exception as e:
+                print("Erro ao entregar notificação:", e)
+
+    @abc.abstractmethod
+    def deliver(self, payload):
+        """Entrega um payload; roda na thread de fundo."""
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=WEBHOOK_TIMEOUT + 1)
+
+
+class FileSink(_QueuedSink):
+    """Uma linha JSON por notificação."""
+
+    def __init__(self, path):
+        self.path = path
+        super().__init__()
+
+    def deliver(self, payload):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+class WebhookSink(_QueuedSink):
+    """POST JSON para uma URL (ex: um endpoint interno ou o stand-in local abaixo)."""
+
+    def __init__(self, url, timeout=WEBHOOK_TIMEOUT):
+        self.url = url
+        self.timeout = timeout
+        super().__init__()
+
+    def deliver(self, payload):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def make_sink(spec):
+    """'stdout', 'file:CAMINHO' ou 'webhook:URL' -> sink."""
+    kind, _, target = spec.partition(":")
+    if kind == "stdout":
+        return StdoutSink()
+    if kind == "file" and target:
+        return FileSink(target)
+    if kind == "webhook" and target:
+        return WebhookSink(target)
+    raise ValueError(f"sink inválido: {spec!r} (use stdout, file:CAMINHO ou webhook:URL)")
+
+
+# ----------------------------------------------------
+# Stand-in local de webhook
+# ----------------------------------------------------
+
+def serve_webhook(port=WEBHOOK_PORT, host="127.0.0.1"):
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = self.rfile.read(length).decode("utf-8", "replace")
+            print(body, flush=True)
+            self.send_response(204)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer((host, port), Handler)
+    print(f"Webhook local em http://{host}:{port}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m core.sinks", description="stand-in local de webhook")
+    parser.add_argument("--port", type=int, default=WEBHOOK_PORT)
+    serve_webhook(parser.parse_args().port)
@@ -0,0 +1,110 @@
+# core/snapshot.py
+"""Snapshot binário do estado de mercado (registros + históricos de preço).
+
+Layout (little-endian):
+    cabeçalho   MAGIC, versão, flags, salvo_em, n_símbolos, offset_históricos
+    entradas    n × (símbolo, 6 campos float64, tendência, n_histórico, início_histórico)
+    históricos  float64 contíguos, na ordem das entradas
+
+A leitura usa mmap: só as entradas são desempacotadas; cada histórico vira uma fatia do
+arquivo mapeado (numpy.frombuffer) sem ler o resto.
+"""
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+from core.market_state import MarketRecord
+
+MAGIC = b"CMSNAP\x00\x00"
+VERSION = 2
+
+_HEADER = struct.Struct("<8sHHdIQ")        # magic, versão, flags, salvo_em, n, offset_históricos
+_ENTRY = struct.Struct("<B31s6dB3xIQ")     # tamanho + símbolo UTF-8, campos, tendência, n_histórico, início
+SYMBOL_BYTES = 31
+
+_TRENDS = ("flat", "up", "down")
+_TREND_CODES = {t: i for i, t in enumerate(_TRENDS)}
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def write_snapshot(path, records, histories):
+    """Grava `records` ({symbol: MarketRecord}) e `histories` ({symbol: [preços]}) de forma atômica."""
+    entries = []
+    chunks = []
+    start = 0
+    for symbol, rec in records.items():
+        # símbolo que não cabe no campo fica de fora, sem derrubar o snapshot inteiro
+        try:
+            raw_symbol = symbol.encode("utf-8")
+        except UnicodeEncodeError:
+            continue
+        if len(raw_symbol) > SYMBOL_BYTES:
+            continue
+        history = np.asarray(histories.get(symbol, ()), dtype="<f8")
+        entries.append(_ENTRY.pack(
+            len(raw_symbol), raw_symbol,
+            rec.price, rec.open_price, rec.price_change_percent,
+            rec.high_price, rec.low_price, rec.volume,
+            _TREND_CODES.get(rec.trend, 0), len(history), start,
+        ))
+        chunks.append(history.tobytes())
+        start += len(history)
+
+    histories_offset = _HEADER.size + _ENTRY.size * len(entries)
+    header = _HEADER.pack(MAGIC, VERSION, 0, time.time(), len(entries), histories_offset)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(b"".join(entries))
+        f.write(b"".join(chunks))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path):
+    """Retorna (salvo_em, [(MarketRecord, np.ndarray histórico)]); SnapshotError se inválido."""
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:   # arquivo vazio
+            raise SnapshotError(str(e))
+
+    with mm:
+        if len(mm) < _HEADER.size:
+            raise SnapshotError("snapshot truncado")
+        magic, version, _flags, saved_at, count, histories_offset = _HEADER.unpack_from(mm, 0)
+        if magic != MAGIC:
+            raise SnapshotError("arquivo não é um snapshot")
+        if version != VERSION:
+            raise SnapshotError(f"versão {version} não suportada")
+        if histories_offset != _HEADER.size + _ENTRY.size * count or histories_offset > len(mm):
+            raise SnapshotError("snapshot corrompido")
+
+        floats = (len(mm) - histories_offset) // 8
+        all_history = np.frombuffer(mm, dtype="<f8", count=floats, offset=histories_offset)
+        try:
+            result = []
+            for (size, raw_symbol, price, open_price, pct, high, low, volume, trend, n, start) \
+                    in _ENTRY.iter_unpack(mm[_HEADER.size:histories_offset]):
+                if size > SYMBOL_BYTES or start + n > floats:
+                    raise SnapshotError("snapshot corrompido")
+                symbol = raw_symbol[:size].decode("utf-8")
+                record = MarketRecord(symbol, price, open_price, pct, high, low, volume,
+                                      _TRENDS[trend] if trend < len(_TRENDS) else "flat")
+                # cópia: o mmap é fechado ao sair deste bloco
+                result.append((record, all_history[start:start + n].copy()))
+        except (struct.error, UnicodeDecodeError, ValueError) as e:
+            raise SnapshotError(f"snapshot corrompido: {e}")
+        finally:
+            # a view do numpy precisa sumir antes do mmap fechar (senão: BufferError)
+            del all_history
+    return saved_at, result
@@ -0,0 +1,119 @@
+# core/symbols.py
+
+import json
+import os
+import threading
+import time
+
+from core.utils import POPULAR_NAMES
+from core.klines import BINANCE_REST_URL, REQUEST_TIMEOUT
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+EXCHANGE_INFO_FILE = os.path.join(RESOURCES_DIR, "exchange_info.json")
+
+EXCHANGE_INFO_PATH = "/api/v3/exchangeInfo"
+EXCHANGE_INFO_MAX_AGE = 24 * 3600   # segundos até buscar o exchangeInfo de novo
+QUOTE_ASSET = "USDT"
+
+
+class SymbolDirectory:
+    """Metadados dos pares (base/quote/status) a partir de um exchangeInfo em cache.
+
+    O arquivo guarda só {symbol: [base, quote, status]}; POPULAR_NAMES entra apenas como
+    nome de exibição.
+    """
+
+    def __init__(self, path=EXCHANGE_INFO_FILE, base_url=BINANCE_REST_URL, transport=None,
+                 max_age=EXCHANGE_INFO_MAX_AGE):
+        self.path = path
+        self.url = base_url.rstrip("/") + EXCHANGE_INFO_PATH
+        self.transport = transport
+        self.max_age = max_age
+        self._symbols = {}
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+
+    # ----------------------------------------------------
+    # Carga
+    # ----------------------------------------------------
+
+    def load(self, refresh=True):
+        self._load_cache()
+        if refresh and self.stale():
+            self.refresh()
+        return self
+
+    def stale(self):
+        return time.time() - self._fetched_at > self.max_age
+
+    def _load_cache(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            with self._lock:
+                self._symbols = cached.get("symbols", {})
+                self._fetched_at = cached.get("fetched_at", 0.0)
+        except Exception:
+            pass
+
+    def refresh(self):
+        try:
+            info = self._get(self.url)
+        except Exception as e:
+            print("Erro ao buscar exchangeInfo:", e)
+            return False
+        return self.apply(info)
+
+    def apply(self, info):
+        """Grava um exchangeInfo já baixado (ex: pelo event loop do motor assíncrono)."""
+        try:
+            symbols = {
+                s["symbol"]: [s["baseAsset"], s["quoteAsset"], s.get("status", "TRADING")]
+                for s in info["symbols"]
+            }
+        except Exception as e:
+            print("Erro ao ler exchangeInfo:", e)
+            return False
+
+        with self._lock:
+            self._symbols = symbols
+            self._fetched_at = time.time()
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"fetched_at": self._fetched_at, "symbols": symbols}, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("Erro ao salvar exchangeInfo:", e)
+        return True
+
+    def _get(self, url):
+        if self.transport is not None:
+            return self.transport(url, None)
+        import requests
+        return requests.get(url, timeout=REQUEST_TIMEOUT).json()
+
+    # ----------------------------------------------------
+    # Consulta
+    # ----------------------------------------------------
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def trading_symbols(self, quote=QUOTE_ASSET):
+        return {
+            sym for sym, (base, q, status) in self._symbols.items()
+            if q == quote and status == "TRADING"
+        }
+
+    def base_asset(self, symbol):
+        meta = self._symbols.get(symbol)
+        if meta:
+            return meta[0]
+        return symbol[:-len(QUOTE_ASSET)] if symbol.endswith(QUOTE_ASSET) else symbol
+
+    def display_name(self, symbol):
+        base = self.base_asset(symbol)
+        return POPULAR_NAMES.get(base, base)
@@ -0,0 +1,313 @@
+# core/tsdb.py
+"""Séries temporais locais: candles OHLCV por símbolo em SQLite (modo WAL).
+
+Os ticks são agregados em memória em candles de 1s/1m/5m/1h e gravados em lote por uma
+thread de fundo; consultas por intervalo leem direto da chave (symbol, resolution, ts).
+"""
+import os
+import sqlite3
+import threading
+import time
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+RESOURCES_DIR = os.path.join(BASE_DIR, "resources")
+TSDB_FILE = os.path.join(RESOURCES_DIR, "timeseries.db")
+
+SCHEMA_VERSION = 1
+RESOLUTIONS = (1, 60, 300, 3600)   # segundos por candle
+
+# quanto tempo cada resolução é mantida (segundos)
+RETENTION = {
+    1: 6 * 3600,
+    60: 14 * 86400,
+    300: 90 * 86400,
+    3600: 3 * 365 * 86400,
+}
+
+FLUSH_INTERVAL = 1.0        # segundos entre gravações em lote
+RETENTION_INTERVAL = 600    # segundos entre limpezas pela política de retenção
+MAX_POINTS = 2000           # pontos por consulta ao escolher a resolução automaticamente
+
+# intervalos de kline da Binance que coincidem com uma resolução local
+INTERVAL_RESOLUTION = {"1s": 1, "1m": 60, "5m": 300, "1h": 3600}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS candles (
+    symbol     TEXT    NOT NULL,
+    resolution INTEGER NOT NULL,
+    ts         INTEGER NOT NULL,
+    open       REAL    NOT NULL,
+    high       REAL    NOT NULL,
+    low        REAL    NOT NULL,
+    close      REAL    NOT NULL,
+    volume     REAL    NOT NULL DEFAULT 0,
+    PRIMARY KEY (symbol, resolution, ts)
+) WITHOUT ROWID
+"""
+
+# candle aberto é regravado a cada lote: a abertura fica, máxima/mínima se combinam e o
+# volume chega como incremento desde o lote anterior
+_UPSERT = """
+INSERT INTO candles (symbol, resolution, ts, open, high, low, close, volume)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (symbol, resolution, ts) DO UPDATE SET
+    high = max(high, excluded.high),
+    low = min(low, excluded.low),
+    close = excluded.close,
+    volume = volume + excluded.volume
+"""
+
+# klines do REST são a fonte oficial: substituem o candle inteiro
+_REPLACE = """
+INSERT OR REPLACE INTO candles (symbol, resolution, ts, open, high, low, close, volume)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SELECT = """
+SELECT ts * 1000, open, high, low, close, volume FROM candles
+WHERE symbol = ? AND resolution = ? AND ts >= ? AND ts <= ?
+ORDER BY ts DESC LIMIT ?
+"""
+
+
+def resolution_for(span, max_points=MAX_POINTS, resolutions=RESOLUTIONS, retention=RETENTION, age=None):
+    """Menor resolução que cobre `span` segundos com no máximo `max_points` candles.
+
+    A resolução também precisa guardar dados de `age` segundos atrás (padrão: `span`, um
+    período que termina agora); sem nenhuma que guarde, fica a de retenção mais longa.
+    """
+    age = span if age is None else age
+    for res in resolutions:
+        if span / res <= max_points and retention.get(res, float("inf")) >= age:
+            return res
+    return max(resolutions, key=lambda res: (retention.get(res, float("inf")), res))
+
+
+class TimeSeriesStore:
+    """Candles OHLCV agregados a partir dos ticks, com gravação em lote e retenção por resolução."""
+
+    def __init__(self, path=TSDB_FILE, resolutions=RESOLUTIONS, retention=RETENTION,
+                 flush_interval=FLUSH_INTERVAL, retention_interval=RETENTION_INTERVAL):
+        self.path = path
+        self.resolutions = tuple(resolutions)
+        self.retention = dict(retention)
+        self.flush_interval = flush_interval
+        self.retention_interval = retention_interval
+
+        self._bars = {}          # (symbol, res) -> [ts, open, high, low, close, volume, sujo]
+        self._finished = []      # candles fechados ainda não gravados
+        self._last_volume = {}   # symbol -> último volume 24h visto (para o incremento)
+        self._lock = threading.Lock()        # protege os candles em memória
+        self._write_lock = threading.Lock()  # serializa a conexão de escrita
+        self._read_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._writer = self._connect()
+        self._create_schema()
+        self._reader = self._connect()
+
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._writer_loop, daemon=True, name="tsdb")
+        self._thread.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")   # em WAL: sem fsync a cada commit
+        return conn
+
+    def _create_schema(self):
+        version = self._writer.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            self._writer.execute(_SCHEMA)
+            self._writer.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    # ----------------------------------------------------
+    # Ingestão (thread do websocket)
+    # ----------------------------------------------------
+
+    def on_tick(self, symbol, metrics):
+        """Tick handler do MarketFeed: preço atual + incremento do volume 24h."""
+        price = metrics.get("price")
+        if not price or self._stop_event.is_set():
+            return
+        volume = metrics.get("volume") or 0.0
+        last = self._last_volume.get(symbol)
+        self._last_volume[symbol] = volume
+        # o volume do ticker é uma janela móvel de 24h: só os aumentos entram no candle
+        self.add(symbol, price, volume - last if last is not None and volume > last else 0.0)
+
+    def add(self, symbol, price, volume=0.0, ts=None):
+        ts = time.time() if ts is None else ts
+        with self._lock:
+            bars = self._bars
+            for res in self.resolutions:
+                start = int(ts // res) * res
+                key = (symbol, res)
+                bar = bars.get(key)
+                if bar is None or bar[0] != start:
+                    if bar is not None and bar[6]:
+                        self._finished.append((symbol, res, *bar[:6]))
+                    bars[key] = [start, price, price, price, price, volume, True]
+                    continue
+                if price > bar[2]:
+                    bar[2] = price
+                if price < bar[3]:
+                    bar[3] = price
+                bar[4] = price
+                bar[5] += volume
+                bar[6] = True
+
+    def import_klines(self, symbol, interval, klines):
+        """Grava klines do REST (formato da Binance) na resolução correspondente, se houver."""
+        res = INTERVAL_RESOLUTION.get(interval)
+        if res not in self.resolutions or not klines:
+            return 0
+        rows = []
+        for k in klines:
+            try:
+                rows.append((symbol, res, int(k[0]) // 1000, float(k[1]), float(k[2]),
+                             float(k[3]), float(k[4]), float(k[5])))
+            except (IndexError, TypeError, ValueError):
+                continue
+        with self._write_lock:
+            try:
+                with self._writer:
+                    self._writer.executemany(_REPLACE, rows)
+            except sqlite3.Error as e:
+                print("Erro ao gravar klines no banco de séries:", e)
+                return 0
+            # o volume do REST já inclui os ticks pendentes do candle aberto: zera o incremento
+            # para o próximo flush não somar o mesmo volume de novo
+            replaced = {row[2] for row in rows}
+            with self._lock:
+                bar = self._bars.get((symbol, res))
+                if bar is not None and bar[0] in replaced:
+                    bar[5] = 0.0
+        return len(rows)
+
+    # ----------------------------------------------------
+    # Gravação em lote
+    # ----------------------------------------------------
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                rows, self._finished = self._finished, []
+                for (symbol, res), bar in self._bars.items():
+                    if bar[6]:
+                        rows.append((symbol, res, *bar[:6]))
+                        bar[5] = 0.0      # próximo lote leva só o volume novo
+                        bar[6] = False
+            if not rows:
+                return 0
+            try:
+                with self._writer:
+                    self._writer.executemany(_UPSERT, rows)
+            except sqlite3.Error as e:
+                print("Erro ao gravar banco de séries:", e)
+                return 0
+            return len(rows)
+
+    def apply_retention(self, now=None):
+        now = time.time() if now is None else now
+        removed = 0
+        with self._write_lock:
+            try:
+                with self._writer:
+                    for res, keep in self.retention.items():
+                        cur = self._writer.execute(
+                            "DELETE FROM candles WHERE resolution = ? AND ts < ?", (res, int(now - keep)))
+                        removed += cur.rowcount
+            except sqlite3.Error as e:
+                print("Erro ao aplicar retenção do banco de séries:", e)
+        return removed
+
+    def _writer_loop(self):
+        next_retention = time.monotonic()
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+            if self.retention_interval and time.monotonic() >= next_retention:
+                next_retention = time.monotonic() + self.retention_interval
+                self.apply_retention()
+
+    # ----------------------------------------------------
+    # Consultas
+    # ----------------------------------------------------
+
+    def candles(self, symbol, resolution=60, start=None, end=None, limit=None):
+        """Candles [ts_ms, open, high, low, close, volume] em ordem crescente de tempo.
+
+        Sem `start`, devolve os `limit` mais recentes (mesmo formato das klines da Binance,
+        então c[0] é a abertura em ms e c[4] o fechamento). Não grava nada: lê o que já está
+        no banco e completa com os candles ainda em memória (chamado da thread da GUI).
+        """
+        lo = int(start or 0)
+        hi = int(end if end is not None else 2 ** 62)
+        params = (symbol, resolution, lo, hi, -1 if limit is None else int(limit))
+        with self._read_lock:
+            try:
+                rows = self._reader.execute(_SELECT, params).fetchall()
+            except sqlite3.Error as e:
+                print("Erro ao consultar banco de séries:", e)
+                return []
+        rows.reverse()
+        candles = [list(r) for r in rows]
+
+        # mesmas regras do _UPSERT, sem tocar no banco
+        by_ts = {c[0]: c for c in candles}
+        for ts, open_, high, low, close, volume in self._pending(symbol, resolution):
+            if not lo <= ts <= hi:
+                continue
+            c = by_ts.get(ts * 1000)
+            if c is None:
+                c = by_ts[ts * 1000] = [ts * 1000, open_, high, low, close, volume]
+                candles.append(c)
+                continue
+            c[2] = max(c[2], high)
+            c[3] = min(c[3], low)
+            c[4] = close
+            c[5] += volume
+        if len(by_ts) > len(rows):
+            candles.sort(key=lambda c: c[0])
+            if limit is not None:
+                candles = candles[-int(limit):]
+        return candles
+
+    def _pending(self, symbol, resolution):
+        # candles ainda não gravados deste símbolo/resolução, em ordem de tempo
+        with self._lock:
+            rows = [r[2:] for r in self._finished if r[0] == symbol and r[1] == resolution]
+            bar = self._bars.get((symbol, resolution))
+            if bar is not None and bar[6]:
+                rows.append(tuple(bar[:6]))
+        return rows
+
+    def query(self, symbol, start, end=None, max_points=MAX_POINTS):
+        """Candles entre `start` e `end` (segundos) na resolução mais fina que caiba em max_points."""
+        end = time.time() if end is None else end
+        res = resolution_for(end - start, max_points, self.resolutions, self.retention,
+                             age=time.time() - start)
+        return self.candles(symbol, res, start, end)
+
+    def symbols(self):
+        with self._read_lock:
+            rows = self._reader.execute("SELECT DISTINCT symbol FROM candles").fetchall()
+        return sorted(r[0] for r in rows)
+
+    # ----------------------------------------------------
+    # Encerramento
+    # ----------------------------------------------------
+
+    def close(self):
+        if self._stop_event.is_set():
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        with self._write_lock, self._read_lock:
+            for conn in (self._reader, self._writer):
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
@@ -19,6 +19,34 @@ POPULAR_NAMES = {
     "AVAX": "Avalanche",
 }
 
+def select_top_tickers(tickers):
+    """Filtra os tickers 24h para os pares USDT de POPULAR_NAMES, por volume em USDT."""
+    valid = list(POPULAR_NAMES.keys())
+
+    usdt_pairs = [
+        t for t in tickers
+        if t["symbol"].endswith("USDT") and t["symbol"][:-4] in valid
+    ]
+
+    return sorted(
+        usdt_pairs,
+        key=lambda x: float(x.get("quoteVolume", 0)),
+        reverse=True
+    )[:len(valid)]
+
+def select_usdt_tickers(tickers, allowed=None):
+    """Modo mercado completo: todos os pares USDT (opcionalmente só os de `allowed`), por volume."""
+    usdt_pairs = [
+        t for t in tickers
+        if t["symbol"].endswith("USDT") and (allowed is None or t["symbol"] in allowed)
+    ]
+
+    return sorted(
+        usdt_pairs,
+        key=lambda x: float(x.get("quoteVolume", 0)),
+        reverse=True
+    )
+
 def format_volume(num):
     num = float(num)
 
@@ -1,149 +1,55 @@
 # core/worker.py
 
-import json
-import threading
-from collections import defaultdict, deque
+from PyQt6.QtCore import QObject, pyqtSignal
 
-from PyQt6.QtCore import QObject, pyqtSignal, QMutex
-
-from binance.spot import Spot
-from websocket import WebSocketApp
-
-from core.utils import POPULAR_NAMES
+from core.connections import STREAM_URL
+from core.feed import MarketFeed, UI_MAX_RATE, DEFAULT_ENGINE, FULL_MARKET
 
 
 class BinanceWorker(QObject):
+    """Adaptador Qt do MarketFeed: os deltas de estado viram o sinal data_updated."""
+
     data_updated = pyqtSignal(dict)
-    data_state = defaultdict(dict)
-    mutex = QMutex()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, max_rate=UI_MAX_RATE, stream_url=STREAM_URL, engine=DEFAULT_ENGINE,
+                 full_market=FULL_MARKET, feed=None):
         super().__init__(parent)
 
-        self.client = Spot()   # REST sem autenticação
-        self.ws = None
-        self.keep_running = True
-        self.thread = None
-
-    # ----------------------------------------------------
-    # REST → coleta inicial
-    # ----------------------------------------------------
-
-    def get_top_symbols(self):
-        try:
-            tickers = self.client.ticker_24hr()
-            valid = list(POPULAR_NAMES.keys())
-
-            usdt_pairs = [
-                t for t in tickers
-                if t["symbol"].endswith("USDT") and t["symbol"][:-4] in valid
-            ]
-
-            top = sorted(
-                usdt_pairs,
-                key=lambda x: float(x.get("quoteVolume", 0)),
-                reverse=True
-            )[:len(valid)]
-
-            self.mutex.lock()
-            for t in top:
-                s = t["symbol"]
-
-                self.data_state[s] = {
-                    "price": float(t["lastPrice"]),
-                    "open_price": float(t["openPrice"]),
-                    "price_change_percent": float(t["priceChangePercent"]),
-                    "high_price": float(t["highPrice"]),
-                    "low_price": float(t["lowPrice"]),
-                    "volume": float(t["volume"]),
-                    "last_price": float(t["lastPrice"]),
-                    "trend": "flat",
-                    "history": deque(maxlen=200)
-                }
-            self.mutex.unlock()
-
-            return [t["symbol"] for t in top]
-
-        except Exception:
-            return [f"{s}USDT" for s in POPULAR_NAMES.keys()]
-
-    # ----------------------------------------------------
-    # WebSocket — mensagem recebida
-    # ----------------------------------------------------
-
-    def _on_message(self, ws, msg):
-        try:
-            msg = json.loads(msg)
-            data = msg.get("data", {})
-            if "s" not in data:
-                return
-
-            symbol = data["s"]
-            price = float(data["c"])
-
-            self.mutex.lock()
-
-            last = self.data_state[symbol].get("last_price", price)
-            trend = "up" if price > last else "down" if price < last else "flat"
-
-            if "history" not in self.data_state[symbol]:
-                self.data_state[symbol]["history"] = deque(maxlen=200)
-
-            self.data_state[symbol].update({
-                "price": price,
-                "open_price": float(data["o"]),
-                "price_change_percent": float(data["P"]),
-                "high_price": float(data["h"]),
-                "low_price": float(data["l"]),
-                "volume": float(data["v"]),
-                "last_price": price,
-                "trend": trend
-            })
-
-            self.data_state[symbol]["history"].append(price)
-
-            self.mutex.unlock()
-
-            self.data_updated.emit(self.data_state)
-
-        except Exception:
-            try:
-                self.mutex.unlock()
-            except:
-                pass
-
-    # ----------------------------------------------------
-    # Iniciar WebSocket
-    # ----------------------------------------------------
+        # `feed` pronto (ex: sem snapshot nem banco de séries) para benchmarks e testes
+        self.feed = feed or MarketFeed(max_rate=max_rate, stream_url=stream_url, engine=engine,
+                                       full_market=full_market)
+        self.feed.add_update_listener(self.data_updated.emit)
 
-    def run(self):
-        symbols = self.get_top_symbols()
-        streams = "/".join([f"{s.lower()}@ticker" for s in symbols])
+        # atalhos usados pela GUI
+        self.state = self.feed.state
+        self.indicators = self.feed.indicators
+        self.symbols = self.feed.symbols
+
+    @property
+    def data_state(self):
+        return self.feed.data_state
 
-        url = f"wss://stream.binance.com:9443/stream?streams={streams}"
+    @property
+    def tsdb(self):
+        return self.feed.tsdb
 
-        self.ws = WebSocketApp(
-            url,
-            on_message=self._on_message
-        )
+    def add_tick_handler(self, handler):
+        self.feed.add_tick_handler(handler)
 
-        self.thread = threading.Thread(target=self.ws.run_forever, daemon=True)
-        self.thread.start()
+    def remove_tick_handler(self, handler):
+        self.feed.remove_tick_handler(handler)
 
-    # ----------------------------------------------------
-    # Parar de forma segura
-    # ----------------------------------------------------
+    def connection_health(self):
+        return self.feed.connection_health()
+
+    def start_recording(self, path=None):
+        return self.feed.start_recording(path)
+
+    def stop_recording(self):
+        self.feed.stop_recording()
+
+    def run(self):
+        self.feed.run()
 
     def stop(self):
-        self.keep_running = False
-        try:
-            if self.ws:
-                self.ws.close()
-        except:
-            pass
-
-        try:
-            if self.thread and self.thread.is_alive():
-                self.thread.join(timeout=1)
-        except:
-            pass
+        self.feed.stop()
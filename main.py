@@ -1,10 +1,36 @@
 # main.py
+import argparse
 import sys
-from PyQt6.QtWidgets import QApplication
-from ui.main_window import CryptoMonitorApp
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Monitor de Criptomoedas - Binance")
+    parser.add_argument("--headless", action="store_true",
+                        help="roda só o núcleo (dados + alertas), sem PyQt6")
+    parser.add_argument("--sink", action="append", dest="sinks", metavar="SPEC",
+                        help="destino das notificações no modo headless: stdout, file:CAMINHO "
+                             "ou webhook:URL (pode repetir)")
+    parser.add_argument("--engine", choices=("thread", "async"), help="motor de rede")
+    parser.add_argument("--full-market", action="store_true", help="todos os pares USDT")
+    parser.add_argument("--status-interval", type=float, default=60,
+                        help="segundos entre linhas de status no modo headless (0 desliga)")
+    # argumentos do Qt (ex: -style) passam adiante para o QApplication
+    return parser.parse_known_args(argv)
+
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = CryptoMonitorApp()
+    args, qt_args = parse_args(sys.argv[1:])
+
+    if args.headless:
+        from core.headless import run_headless
+        run_headless(args.sinks, engine=args.engine, full_market=args.full_market,
+                     status_interval=args.status_interval)
+        sys.exit(0)
+
+    from PyQt6.QtWidgets import QApplication
+    from ui.main_window import CryptoMonitorApp
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = CryptoMonitorApp(engine=args.engine, full_market=args.full_market)
     window.show()
     sys.exit(app.exec())
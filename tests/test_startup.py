@@ -0,0 +1,17 @@
+# tests/test_startup.py
+"""Orçamento de partida a frio (benchmarks/bench_startup.py) verificado a cada execução dos testes."""
+import importlib.util
+
+import pytest
+
+from benchmarks.bench_startup import STARTUP_BUDGET, STARTUP_MODULES, probe
+
+
+@pytest.mark.parametrize("name", sorted(STARTUP_BUDGET))
+def test_cold_start_within_budget(name):
+    module = STARTUP_MODULES[name]
+    if module.startswith("ui.") and importlib.util.find_spec("PyQt6") is None:
+        pytest.skip("PyQt6 não instalado")
+    ms, heavy = probe(module)
+    assert heavy == [], f"{module} importa módulos pesados na partida: {heavy}"
+    assert ms <= STARTUP_BUDGET[name], f"{module}: {ms:.0f} ms > {STARTUP_BUDGET[name]:.0f} ms"
@@ -0,0 +1,53 @@
+# tests/test_tsdb.py
+import time
+
+from core.tsdb import RETENTION, TimeSeriesStore, resolution_for
+from ui.history_window import FETCH_POINTS, RANGES
+
+DAY = 86400
+
+
+def _store(tmp_path):
+    # sem threads de fundo agindo sozinhas: flush e retenção são chamados pelo teste
+    return TimeSeriesStore(str(tmp_path / "timeseries.db"), flush_interval=3600, retention_interval=0)
+
+
+def test_resolution_respects_retention():
+    for _label, span in RANGES:
+        res = resolution_for(span, FETCH_POINTS)
+        assert RETENTION[res] >= span
+        assert span / res <= FETCH_POINTS
+
+
+def test_query_30_days_returns_30_days(tmp_path):
+    store = _store(tmp_path)
+    try:
+        now = time.time()
+        for ts in range(int(now - 30 * DAY), int(now), 600):
+            store.add("BTCUSDT", 100.0 + ts % 7, 1.0, ts=ts)
+        store.flush()
+        store.apply_retention(now)
+
+        candles = store.query("BTCUSDT", now - 30 * DAY, now, max_points=FETCH_POINTS)
+        first, last = candles[0][0] / 1000, candles[-1][0] / 1000
+        assert first - (now - 30 * DAY) < DAY
+        assert now - last < DAY
+    finally:
+        store.close()
+
+
+def test_candles_include_unflushed_ticks_without_writing(tmp_path):
+    store = _store(tmp_path)
+    try:
+        ts = int(time.time() // 60) * 60
+        store.add("ETHUSDT", 10.0, 2.0, ts=ts)
+        store.flush()
+        store.add("ETHUSDT", 12.0, 3.0, ts=ts + 1)
+
+        candle = store.candles("ETHUSDT", 60)[-1]
+        assert candle == [ts * 1000, 10.0, 12.0, 10.0, 12.0, 5.0]
+        # nada foi gravado pela consulta: o incremento continua pendente
+        assert store.flush() > 0
+        assert store.candles("ETHUSDT", 60)[-1] == candle
+    finally:
+        store.close()
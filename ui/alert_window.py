@@ -4,6 +4,9 @@ from PyQt6.QtWidgets import (
     QSpinBox, QPushButton, QMessageBox
 )
 from core.utils import POPULAR_NAMES
+from core.alert_engine import (
+    COND_WINDOW_MOVE, COND_MA_CROSS, COND_VOLUME_SPIKE, COND_SPREAD, DEFAULT_WINDOW
+)
 
 
 class AlertConfigWindow(QDialog):
@@ -22,12 +25,12 @@ class AlertConfigWindow(QDialog):
 
         # Mostrar "Bitcoin (BTC)" em vez de só "BTCUSDT"
         display_list = []
+        self.symbol_map = {}
         for s in symbols:
             base = s.replace("USDT", "")
             name = POPULAR_NAMES.get(base, base)
             display_list.append(f"{name} ({base})")
-
-        self.symbol_map = {f"{POPULAR_NAMES.get(s.replace('USDT',''), s)} ({s.replace('USDT','')})": s for s in symbols}
+            self.symbol_map[display_list[-1]] = s
 
         self.symbol_combo.addItems(display_list)
         layout.addRow("Criptomoeda:", self.symbol_combo)
@@ -41,9 +44,43 @@ class AlertConfigWindow(QDialog):
             "Preço Abaixo de",
             "Variação % Acima de",
             "Variação % Abaixo de",
+            "RSI Acima de",
+            "RSI Abaixo de",
+            "Volatilidade Acima de",
+            "SMA Acima de",
+            "SMA Abaixo de",
+            "Variação % em Janela Acima de",
+            "Variação % em Janela Abaixo de",
+            "Cruza Acima da Média Móvel",
+            "Cruza Abaixo da Média Móvel",
+            "Pico de Volume Acima de",
+            "Spread % Acima de",
+            "Spread % Abaixo de",
         ])
+        self.condition_combo.currentTextChanged.connect(self.update_parameter_rows)
         layout.addRow("Condição:", self.condition_combo)
 
+        ########################################################################
+        # PARÂMETROS DAS CONDIÇÕES COM JANELA (só aparecem quando usados)
+        ########################################################################
+        self.window_spin = QSpinBox()
+        self.window_spin.setRange(5, 86400)
+        self.window_spin.setSingleStep(30)
+        self.window_spin.setSuffix(" s")
+        self.window_spin.setValue(DEFAULT_WINDOW)
+        layout.addRow("Janela:", self.window_spin)
+
+        self.ma_combo = QComboBox()
+        self.ma_combo.addItem("SMA", "sma")
+        self.ma_combo.addItem("EMA", "ema")
+        layout.addRow("Média Móvel:", self.ma_combo)
+
+        self.symbol2_combo = QComboBox()
+        self.symbol2_combo.addItems(display_list)
+        layout.addRow("Comparar com:", self.symbol2_combo)
+
+        self.layout_form = layout
+
         ########################################################################
         # VALOR DO ALERTA
         ########################################################################
@@ -71,6 +108,17 @@ class AlertConfigWindow(QDialog):
         save_btn.clicked.connect(self.validate_and_accept)
         layout.addWidget(save_btn)
 
+        self.update_parameter_rows(self.condition_combo.currentText())
+
+    ########################################################################
+    # MOSTRAR APENAS OS PARÂMETROS DA CONDIÇÃO ESCOLHIDA
+    ########################################################################
+    def update_parameter_rows(self, cond):
+        uses_window = cond.startswith(COND_WINDOW_MOVE) or cond.startswith(COND_VOLUME_SPIKE)
+        self.layout_form.setRowVisible(self.window_spin, uses_window)
+        self.layout_form.setRowVisible(self.ma_combo, cond.startswith(COND_MA_CROSS))
+        self.layout_form.setRowVisible(self.symbol2_combo, cond.startswith(COND_SPREAD))
+
     ########################################################################
     # VALIDAR E SALVAR ALERTA
     ########################################################################
@@ -82,7 +130,14 @@ class AlertConfigWindow(QDialog):
             QMessageBox.warning(self, "Erro", "Selecione uma criptomoeda válida.")
             return
 
-        if value == 0:
+        cond = self.condition_combo.currentText()
+        if cond.startswith(COND_SPREAD) and \
+                self.symbol2_combo.currentText() == selected:
+            QMessageBox.warning(self, "Erro", "Escolha duas criptomoedas diferentes para o spread.")
+            return
+
+        # cruzamento com deslocamento 0 (a própria média) é válido
+        if value == 0 and not cond.startswith(COND_MA_CROSS):
             QMessageBox.warning(self, "Valor inválido",
                                 "O valor do alerta não pode ser zero.\n"
                                 "Escolha um valor maior ou menor.")
@@ -97,8 +152,19 @@ class AlertConfigWindow(QDialog):
         display_text = self.symbol_combo.currentText()
         symbol = self.symbol_map[display_text]  # converte novamente para "BTCUSDT"
 
-        return {
+        cond = self.condition_combo.currentText()
+        alert = {
             "symbol": symbol,
-            "condition": self.condition_combo.currentText(),
+            "condition": cond,
             "value": self.value_spin.value()
         }
+
+        # parâmetros extras só para as condições que os usam
+        if cond.startswith(COND_WINDOW_MOVE) or cond.startswith(COND_VOLUME_SPIKE):
+            alert["window"] = self.window_spin.value()
+        elif cond.startswith(COND_MA_CROSS):
+            alert["ma"] = self.ma_combo.currentData()
+        elif cond.startswith(COND_SPREAD):
+            alert["symbol2"] = self.symbol_map[self.symbol2_combo.currentText()]
+
+        return alert
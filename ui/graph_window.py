@@ -1,21 +1,87 @@
 # ui/graph_window.py
-import requests
-import datetime
-from PyQt6.QtWidgets import QDialog, QVBoxLayout
-from PyQt6.QtCore import Qt
+import threading
+
+import numpy as np
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton
+from PyQt6.QtCore import Qt, QTimer, QPointF, QRectF, pyqtSignal
+from PyQt6.QtGui import QPicture, QPainter
 import pyqtgraph as pg
 
+from core.klines import KlineLoader
+from core.lod import LodPyramid, OhlcPyramid
+from core.ringbuffer import RingBuffer
+from core.tsdb import INTERVAL_RESOLUTION
+
+LIVE_POINTS = 2000   # pontos mantidos no modo tempo real
+LIVE_FPS = 10        # redesenhos por segundo no modo tempo real
+HISTORY_CANDLES = 7 * 1440   # candles locais carregados (7 dias de 1m); o zoom decide o detalhe
+CANDLE_PIXELS = 4            # largura mínima, em pixels, de cada candle desenhado
+
+
+class CandlestickItem(pg.GraphicsObject):
+    """Candles OHLC desenhados numa QPicture (redesenhada só quando os dados mudam)."""
+
+    def __init__(self, up="#00c070", down="#e04050"):
+        super().__init__()
+        self._pens = (pg.mkPen(up), pg.mkPen(down))
+        self._brushes = (pg.mkBrush(up), pg.mkBrush(down))
+        self.picture = QPicture()
+
+    def set_data(self, x, open_, high, low, close, width):
+        self.picture = QPicture()
+        painter = QPainter(self.picture)
+        half = width * 0.35
+        for xi, o, h, l, c in zip(x, open_, high, low, close):
+            side = 0 if c >= o else 1
+            painter.setPen(self._pens[side])
+            painter.setBrush(self._brushes[side])
+            painter.drawLine(QPointF(xi, l), QPointF(xi, h))
+            painter.drawRect(QRectF(xi - half, o, 2 * half, c - o))
+        painter.end()
+        self.prepareGeometryChange()
+        self.update()
+
+    def paint(self, painter, *args):
+        painter.drawPicture(0, 0, self.picture)
+
+    def boundingRect(self):
+        return QRectF(self.picture.boundingRect())
+
 
 class GraphWindow(QDialog):
-    def __init__(self, parent=None, symbol="BTCUSDT"):
+    klines_loaded = pyqtSignal(str, str, list)
+
+    def __init__(self, parent=None, symbol="BTCUSDT", loader=None, worker=None,
+                 interval="1m", limit=120):
         super().__init__(parent)
 
         self.symbol = symbol
+        self.interval = interval
+        self.limit = limit
+        self.loader = loader or KlineLoader()
+        self.worker = worker
+        self.store = worker.tsdb if worker is not None else None   # candles locais (core/tsdb.py)
         self.setWindowTitle(f"Gráfico - {symbol}")
         self.setMinimumSize(900, 500)
 
         layout = QVBoxLayout(self)
 
+        controls = QHBoxLayout()
+        self.live_button = QPushButton("Tempo Real")
+        self.live_button.setCheckable(True)
+        self.live_button.setEnabled(worker is not None)
+        self.live_button.toggled.connect(self.set_live)
+        controls.addWidget(self.live_button)
+        self.history_button = QPushButton("Histórico")
+        self.history_button.clicked.connect(self.open_history)
+        controls.addWidget(self.history_button)
+        self.candle_button = QPushButton("Candles")
+        self.candle_button.setCheckable(True)
+        self.candle_button.toggled.connect(self._render)
+        controls.addWidget(self.candle_button)
+        controls.addStretch(1)
+        layout.addLayout(controls)
+
         # Criação do widget de gráfico
         self.plot_widget = pg.PlotWidget()
         self.plot_widget.showGrid(x=True, y=True)
@@ -25,43 +91,151 @@ class GraphWindow(QDialog):
 
         layout.addWidget(self.plot_widget)
 
-        # Carregar dados
+        # um único PlotDataItem, atualizado com setData (sem clear/replot)
+        self.curve = self.plot_widget.plot([], [], pen=pg.mkPen('#00ff80', width=2))
+        self.candles_item = CandlestickItem()
+        self.plot_widget.addItem(self.candles_item)
+
+        # histórico: pirâmides de detalhe; a cada zoom/arraste só a faixa visível é desenhada,
+        # no nível que cabe na largura do gráfico
+        self._lines = None
+        self._ohlc = None
+        self.plot_widget.setAutoVisible(y=True)
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self._render)
+        self.plot_widget.sigXRangeChanged.connect(lambda *_: self._render_timer.start(0))
+
+        # modo tempo real: ring buffer alimentado pela thread do websocket,
+        # copiado para arrays de exibição pré-alocados no ritmo do frame_timer
+        self._ring = RingBuffer(LIVE_POINTS)
+        self._ring_lock = threading.Lock()
+        self._dirty = False
+        self._x = np.arange(LIVE_POINTS, dtype=np.float64)
+        self._display = np.zeros(LIVE_POINTS, dtype=np.float64)
+        self._frame_timer = QTimer(self)
+        self._frame_timer.timeout.connect(self._refresh_live)
+
+        self.finished.connect(lambda _: self._stop_live())
+
+        # Carregar dados: cache na hora, rede em segundo plano
+        self.klines_loaded.connect(self._on_klines_loaded)
         self.load_graph()
 
-    def load_graph(self):
-        try:
-            url = "https://api.binance.com/api/v3/klines"
-            params = {
-                "symbol": self.symbol,
-                "interval": "1m",
-                "limit": 120
-            }
-            response = requests.get(url, params=params)
-            data = response.json()
-
-            # Se a API retornar erro
-            if isinstance(data, dict) and "code" in data:
-                print("Erro Binance API:", data)
-                return
+    # ----------------------------------------------------
+    # Klines (REST)
+    # ----------------------------------------------------
 
-            timestamps = []
-            prices = []
+    def load_graph(self):
+        # candles gravados localmente (ticks + klines já baixadas) ou, sem eles, o cache de klines
+        cached = self._local_candles() or self.loader.cached(self.symbol, self.interval)
+        if cached:
+            self._draw(cached)
+        self.loader.fetch(self.symbol, self.interval, self.limit, callback=self._emit_loaded)
 
-            for candle in data:
-                open_time = candle[0] / 1000
-                price = float(candle[4])  # preço de fechamento
-                timestamps.append(datetime.datetime.fromtimestamp(open_time))
-                prices.append(price)
+    def _local_candles(self):
+        res = INTERVAL_RESOLUTION.get(self.interval)
+        if self.store is None or res is None:
+            return []
+        return self.store.candles(self.symbol, res, limit=HISTORY_CANDLES)
 
-            # Limpar gráfico
-            self.plot_widget.clear()
+    def _emit_loaded(self, symbol, interval, candles):
+        # roda na thread do pool; o sinal leva o resultado para a thread da GUI
+        if self.store is not None:
+            self.store.import_klines(symbol, interval, candles)
+        try:
+            self.klines_loaded.emit(symbol, interval, candles)
+        except RuntimeError:
+            pass  # janela já foi fechada
 
-            # Plotar
-            self.plot_widget.plot(
-                list(range(len(prices))),
-                prices,
-                pen=pg.mkPen('#00ff80', width=2)
-            )
+    def _on_klines_loaded(self, symbol, interval, candles):
+        if symbol == self.symbol and interval == self.interval and not self.live_button.isChecked():
+            # as klines novas já foram gravadas no banco local: ele tem o histórico mais longo
+            self._draw(self._local_candles() or candles)
 
+    def _draw(self, candles):
+        try:
+            ohlc = np.array([c[1:5] for c in candles], dtype=np.float64).reshape(-1, 4)
         except Exception as e:
             print("Erro ao gerar gráfico:", e)
+            return
+        n = len(ohlc)
+        x = np.arange(n, dtype=np.float64)
+        self._lines = LodPyramid(x, ohlc[:, 3])   # preço de fechamento
+        self._ohlc = OhlcPyramid(x, ohlc[:, 0], ohlc[:, 1], ohlc[:, 2], ohlc[:, 3])
+
+        # abre mostrando os últimos `limit` candles; o resto fica a um zoom de distância
+        self.plot_widget.setXRange(max(0, n - self.limit), n, padding=0.02)
+        self.plot_widget.enableAutoRange(axis="y")
+        self._render()
+
+    def _render(self):
+        if self._lines is None or self.live_button.isChecked():
+            return
+        view = self.plot_widget.getViewBox()
+        x0, x1 = view.viewRange()[0]
+        pixels = max(int(view.width()), 100)
+
+        if self.candle_button.isChecked():
+            self.curve.setData([], [])
+            self.candles_item.set_data(*self._ohlc.select(x0, x1, pixels // CANDLE_PIXELS))
+        else:
+            self.candles_item.set_data((), (), (), (), (), 1.0)
+            # dois pontos (mín/máx) por pixel
+            self.curve.setData(*self._lines.select(x0, x1, 2 * pixels))
+
+    def open_history(self):
+        from ui.history_window import HistoryDialog
+        dialog = HistoryDialog(self, symbol=self.symbol, store=self.store)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.show()
+
+    # ----------------------------------------------------
+    # Tempo real (ticks do BinanceWorker)
+    # ----------------------------------------------------
+
+    def set_live(self, enabled):
+        self.candle_button.setEnabled(not enabled)
+        if not enabled:
+            self._stop_live()
+            self.load_graph()
+            return
+        if self.worker is None:
+            return
+
+        # ticks crus, sem pirâmide: o buffer já é limitado a LIVE_POINTS
+        self.candles_item.set_data((), (), (), (), (), 1.0)
+        self.plot_widget.enableAutoRange()
+
+        with self._ring_lock:
+            self._ring.clear()
+            self._ring.extend(self.worker.state.history(self.symbol))
+            self._dirty = True
+        self.worker.add_tick_handler(self._on_tick)
+        self._frame_timer.start(1000 // LIVE_FPS)
+        self._refresh_live()
+
+    def _stop_live(self):
+        self._frame_timer.stop()
+        if self.worker is not None:
+            self.worker.remove_tick_handler(self._on_tick)
+
+    def _on_tick(self, symbol, metrics):
+        # thread do websocket: só acumula, quem desenha é o frame_timer
+        if symbol != self.symbol:
+            return
+        price = metrics.get("price")
+        if price is None:
+            return
+        with self._ring_lock:
+            self._ring.append(price)
+            self._dirty = True
+
+    def _refresh_live(self):
+        with self._ring_lock:
+            if not self._dirty:
+                return
+            n = len(self._ring)
+            np.copyto(self._display[:n], self._ring.view())
+            self._dirty = False
+        self.curve.setData(self._x[:n], self._display[:n])
@@ -1,44 +1,110 @@
 # ui/history_window.py
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel
+import time
+
+import numpy as np
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QComboBox
 from PyQt6.QtCore import Qt
-try:
-    from matplotlib.figure import Figure
-    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-except Exception:
-    Figure = None
-    FigureCanvas = None
-import json, os
+from core.lod import LodPyramid
+from core.price_history import read_tail, HISTORY_LEN
+
+# períodos consultados no banco de séries (core/tsdb.py); a resolução sai do tamanho do período
+RANGES = (
+    ("1 hora", 3600),
+    ("24 horas", 86400),
+    ("7 dias", 7 * 86400),
+    ("30 dias", 30 * 86400),
+)
+FETCH_POINTS = 50_000   # candles lidos por período; a pirâmide decide quantos são desenhados
 
-BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
-PRICE_HISTORY_FILE = os.path.join(BASE_DIR, 'resources', 'price_history.json')
 
 class HistoryDialog(QDialog):
-    def __init__(self, parent=None, symbol=None):
+    def __init__(self, parent=None, symbol=None, store=None):
         super().__init__(parent)
         self.setWindowTitle(f'Histórico - {symbol}')
         self.setMinimumSize(600, 400)
+        self.symbol = symbol
+        self.store = store
         layout = QVBoxLayout(self)
 
+        # matplotlib só é importado quando o diálogo abre
+        try:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+            from matplotlib.backends.backend_qtagg import NavigationToolbar2QT as NavigationToolbar
+        except Exception:
+            Figure = None
+            FigureCanvas = None
+
         if Figure is None or FigureCanvas is None:
             layout.addWidget(QLabel('matplotlib não está instalado. Instale matplotlib para visualizar gráficos.'))
             return
 
-        # load price history
-        try:
-            with open(PRICE_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                p = json.load(f)
-        except Exception:
-            p = {}
+        self.range_combo = None
+        if store is not None:
+            self.range_combo = QComboBox()
+            for label, span in RANGES:
+                self.range_combo.addItem(label, span)
+            self.range_combo.setCurrentIndex(1)
+            self.range_combo.currentIndexChanged.connect(self.plot)
+            layout.addWidget(self.range_combo)
 
-        series = p.get(symbol, [])
-        if not series:
-            layout.addWidget(QLabel('Sem histórico para este símbolo.'))
-            return
+        self.figure = Figure(figsize=(6,4))
+        self.ax = self.figure.add_subplot(111)
+        self.canvas = FigureCanvas(self.figure)
+        layout.addWidget(NavigationToolbar(self.canvas, self))
+        layout.addWidget(self.canvas)
 
-        fig = Figure(figsize=(6,4))
-        ax = fig.add_subplot(111)
-        ax.plot(series)
-        ax.set_title(symbol)
-        ax.set_ylabel('Preço (USDT)')
-        canvas = FigureCanvas(fig)
-        layout.addWidget(canvas)
+        self.line = None
+        self._pyramid = None
+        self._rendering = False
+        self.plot()
+
+    def _series(self):
+        # candles do banco de séries no período escolhido (x em dias, como as datas do matplotlib)
+        if self.store is not None:
+            end = time.time()
+            candles = self.store.query(self.symbol, end - self.range_combo.currentData(), end,
+                                       max_points=FETCH_POINTS)
+            if candles:
+                data = np.array([(c[0], c[4]) for c in candles], dtype=np.float64)
+                return data[:, 0] / 86_400_000, data[:, 1], True
+
+        # sem banco de séries: lê apenas o final do arquivo antigo do símbolo (só leitura)
+        series = read_tail(self.symbol, HISTORY_LEN)
+        return np.arange(len(series), dtype=np.float64), np.asarray(series, dtype=np.float64), False
+
+    def plot(self):
+        x, y, dates = self._series()
+        self.ax.clear()
+        self.line = None
+        self._pyramid = None
+        if len(y):
+            self._pyramid = LodPyramid(x, y)
+            self.line, = self.ax.plot(*self._pyramid.select(max_points=self._max_points()))
+            # zoom/arraste pela barra de ferramentas: redesenha só a faixa visível, no nível de
+            # detalhe que cabe na largura do gráfico (clear() descarta os callbacks do eixo)
+            self.ax.callbacks.connect('xlim_changed', lambda ax: self._render())
+            if dates:
+                self.ax.xaxis_date()
+                self.figure.autofmt_xdate()
+        else:
+            self.ax.text(0.5, 0.5, 'Sem histórico para este símbolo.', ha='center', va='center',
+                         transform=self.ax.transAxes)
+        self.ax.set_title(self.symbol)
+        self.ax.set_ylabel('Preço (USDT)')
+        self.canvas.draw_idle()
+
+    def _max_points(self):
+        # dois pontos (mín/máx) por pixel
+        return 2 * max(self.canvas.width(), 100)
+
+    def _render(self):
+        if self.line is None or self._rendering:
+            return
+        self._rendering = True
+        try:
+            x0, x1 = self.ax.get_xlim()
+            self.line.set_data(*self._pyramid.select(x0, x1, self._max_points()))
+            self.canvas.draw_idle()
+        finally:
+            self._rendering = False
@@ -4,23 +4,24 @@ import os
 from collections import deque
 
 from PyQt6.QtWidgets import (
-    QMainWindow, QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem,
+    QMainWindow, QWidget, QVBoxLayout, QTableView,
     QHeaderView, QLabel, QLineEdit, QPushButton, QMessageBox, QHBoxLayout,
     QDialog, QSizePolicy, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QTimer, QVariant, QThread
-from PyQt6.QtGui import QColor, QBrush
+from PyQt6.QtCore import Qt, QTimer, QVariant, QThread, pyqtSignal
 
 from core.worker import BinanceWorker
-from core.alerts import AlertManager
-from core.utils import POPULAR_NAMES, format_volume
+from core.alerts import AlertManager, notify_user
+from core.klines import KlineLoader
+from ui.market_model import MarketTableModel, MarketFilterProxy, SYMBOL_ROLE, format_price
 from ui.alert_window import AlertConfigWindow
-from ui.graph_window import GraphWindow
 from ui.style import STYLE_DARK
 
 
 class CryptoMonitorApp(QMainWindow):
-    def __init__(self):
+    alert_triggered = pyqtSignal(str, str, str)
+
+    def __init__(self, engine=None, full_market=False, worker=None, alert_manager=None):
         super().__init__()
         self.setWindowTitle("Monitor de Criptomoedas - Binance (Tempo Real) v1.1")
         self.setGeometry(80, 40, 1200, 700)
@@ -29,7 +30,8 @@ class CryptoMonitorApp(QMainWindow):
         self.setCentralWidget(self.central_widget)
         self.layout = QVBoxLayout(self.central_widget)
 
-        self.alert_manager = AlertManager()
+        # worker/alert_manager prontos só para benchmarks (sem rede nem arquivos do app)
+        self.alert_manager = alert_manager or AlertManager()
         self.worker = None
         self.worker_thread = None
 
@@ -38,16 +40,39 @@ class CryptoMonitorApp(QMainWindow):
 
         # THREAD DO WORKER
         self.worker_thread = QThread()
-        self.worker = BinanceWorker()
+        if worker is None:
+            worker_args = {"full_market": full_market}
+            if engine:
+                worker_args["engine"] = engine
+            worker = BinanceWorker(**worker_args)
+        self.worker = worker
+        # com o banco de séries ligado, o histórico de preços vem dele (sem gravar em dobro)
+        self.alert_manager.record_prices = not self.worker.feed.tsdb_file
+        self.model.set_name_resolver(self.worker.symbols.display_name)
+        self.model.set_tooltip_provider(self.indicator_tooltip)
+        # modo async: klines pela sessão aiohttp do motor, no mesmo event loop dos streams
+        self.kline_loader = KlineLoader(engine=self.worker.feed.engine)
         self.worker.moveToThread(self.worker_thread)
         self.worker.data_updated.connect(self.update_table)
+
+        # tabela preenchida já com o último estado salvo; o worker atualiza em seguida
+        if len(self.worker.state):
+            self.update_table(self.worker.data_state)
         self.worker_thread.started.connect(self.worker.run)
+
+        # ALERTAS AVALIADOS A CADA TICK (thread do websocket);
+        # as notificações voltam para a GUI pelo sinal alert_triggered
+        self.alert_triggered.connect(self._on_alert_triggered)
+        self.alert_manager.add_listener(self.alert_triggered.emit)
+        self.alert_manager.attach_indicators(self.worker.indicators)
+        self.worker.add_tick_handler(self.alert_manager.process_tick)
+
         self.worker_thread.start()
 
-        # TIMER PARA VERIFICAR ALERTAS
-        self.alert_timer = QTimer(self)
-        self.alert_timer.timeout.connect(self._check_alerts)
-        self.alert_timer.start(1000)
+        # STATUS DAS CONEXÕES (preços congelados ficam visíveis)
+        self.status_timer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_connection_status)
+        self.status_timer.start(2000)
 
     # ================================================================
     # INTERFACE PRINCIPAL
@@ -82,17 +107,24 @@ class CryptoMonitorApp(QMainWindow):
         self.clear_alerts_button.clicked.connect(self.clear_all_alerts)
         control_layout.addWidget(self.clear_alerts_button)
 
+        # Estado das conexões websocket
+        self.status_label = QLabel("Conectando...")
+        control_layout.addWidget(self.status_label)
+
         self.layout.addWidget(control_widget)
 
         # ======================================================
         # TABELA PRINCIPAL
         # ======================================================
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels([
-            "Nome", "Símbolo", "Preço Atual (USDT)", "Variação % (24h)",
-            "Volume (24h)", "Preço Máx (24h)", "Preço Mín (24h)"
-        ])
+        # modelo em colunas + proxy para ordenação/filtro
+        self.model = MarketTableModel(self)
+        self.proxy = MarketFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(1, Qt.SortOrder.AscendingOrder)
 
         header = self.table.horizontalHeader()
         header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
@@ -109,14 +141,14 @@ class CryptoMonitorApp(QMainWindow):
         self.table.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
         self.table.setStyleSheet("""
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #444 !important;
                 color: white !important;
             }
         """)
 
         self.table.verticalHeader().setVisible(False)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.table.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
 
         self.layout.addWidget(self.table, 1)
@@ -139,8 +171,6 @@ class CryptoMonitorApp(QMainWindow):
         self.layout.addWidget(self.alert_panel)
         self.update_alert_panel()
 
-        self._symbol_to_row = {}
-
     # ================================================================
     # ALERTAS
     # ================================================================
@@ -157,54 +187,110 @@ class CryptoMonitorApp(QMainWindow):
             val = alert.get('value', 0)
             color = "#1fff53" if "Acima" in cond else "#ff3c3c"
             formatted = f"{val:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
-            alert_text += f"<span style='color:{color};'>• {s}</span> | {cond} <b>{formatted}</b><br>"
+            extra = ""
+            if "window" in alert:
+                extra = f" em {alert['window']}s"
+            elif "ma" in alert:
+                extra = f" ({alert['ma'].upper()})"
+            elif "symbol2" in alert:
+                extra = f" vs {alert['symbol2'].replace('USDT', '')}"
+            alert_text += f"<span style='color:{color};'>• {s}</span> | {cond} <b>{formatted}</b>{extra}<br>"
 
         self.alert_panel.setText(alert_text)
 
+    # ================================================================
+    # STATUS DA CONEXÃO
+    # ================================================================
+    def update_connection_status(self):
+        try:
+            health = self.worker.connection_health()
+        except Exception:
+            return
+        if not health:
+            return
+
+        online = sum(1 for h in health if h["connected"])
+        rate = sum(h["messages_per_sec"] for h in health)
+        ages = [h["last_message_age"] for h in health if h["last_message_age"] is not None]
+        oldest = max(ages) if ages else None
+
+        if online == len(health) and oldest is not None and oldest < 10:
+            color = "#1fff53"
+            text = f"● {online}/{len(health)} conexões · {rate:.0f} msg/s"
+        else:
+            color = "#ff3c3c"
+            since = f"sem dados há {oldest:.0f}s" if oldest is not None else "sem dados"
+            reconnects = sum(h["reconnects"] for h in health)
+            text = f"● {online}/{len(health)} conexões · {since} · reconexões: {reconnects}"
+
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {color};")
+
+    # ================================================================
+    # INDICADORES (tooltip da tabela)
+    # ================================================================
+    def indicator_tooltip(self, symbol):
+        ind = self.worker.indicators.get(symbol) if self.worker else None
+        if ind is None or ind.sma is None:
+            return None
+
+        def fmt(value, pattern="{:.2f}"):
+            return "—" if value is None else pattern.format(value).replace('.', ',')
+
+        return (
+            f"<b>{symbol}</b> ({ind.samples} ticks)<br>"
+            f"SMA: {format_price(ind.sma)}<br>"
+            f"EMA: {format_price(ind.ema) if ind.ema is not None else '—'}<br>"
+            f"VWAP: {format_price(ind.vwap) if ind.vwap is not None else '—'}<br>"
+            f"RSI: {fmt(ind.rsi, '{:.1f}')}<br>"
+            f"Volatilidade: {fmt(ind.volatility, '{:.3f}%')}"
+        )
+
     # ================================================================
     # FILTRO
     # ================================================================
     def filter_table(self, text: str):
-        text = text.lower().strip()
-        for r in range(self.table.rowCount()):
-            name = self.table.item(r, 0)
-            sym = self.table.item(r, 1)
-            visible = (text in name.text().lower()) or (text in sym.text().lower())
-            self.table.setRowHidden(r, not visible)
+        self.proxy.set_filter_text(text)
 
     # ================================================================
     # CONFIGURAR ALERTA
     # ================================================================
     def open_alert_config(self):
-        if not self.worker or not getattr(self.worker, "data_state", None):
+        if not self.worker or not len(self.worker.state):
             QMessageBox.warning(self, "Erro", "Aguarde o carregamento dos dados.")
             return
 
-        dialog = AlertConfigWindow(self, symbols=sorted(self.worker.data_state.keys()))
+        dialog = AlertConfigWindow(self, symbols=sorted(self.worker.state.symbols()))
         if dialog.exec() == QDialog.DialogCode.Accepted:
             alert_data = dialog.get_alert_data()
-            self.alert_manager.active_alerts.append(alert_data)
-            self.alert_manager.save_alerts()
+            self.alert_manager.add_alert(alert_data)
             self.update_alert_panel()
 
     # ================================================================
     # LIMPAR ALERTAS
     # ================================================================
     def clear_all_alerts(self):
-        self.alert_manager.active_alerts = []
-        self.alert_manager.save_alerts()
+        self.alert_manager.clear_alerts()
         self.update_alert_panel()
         QMessageBox.information(self, "OK", "Todos os alertas foram removidos.")
 
     # ================================================================
-    # CHECAR ALERTAS
+    # ALERTA DISPARADO (emitido pela thread do websocket)
     # ================================================================
-    def _check_alerts(self):
+    def _on_alert_triggered(self, kind, title, message):
         try:
-            self.alert_manager.check_alerts(self, self.worker.data_state)
-        except:
+            notify_user(title, message)
+        except Exception:
             pass
+
+        if kind != "alert":
+            return
+
         self.update_alert_panel()
+        try:
+            QMessageBox.critical(self, title, message)
+        except Exception:
+            print(f"Alerta: {message}")
 
     # ================================================================
     # APLICAR STYLE DARK
@@ -217,66 +303,7 @@ class CryptoMonitorApp(QMainWindow):
     # ================================================================
     def update_table(self, data_state: dict):
         try:
-            self.table.setSortingEnabled(False)
-            symbols = sorted(data_state.keys())
-            self.table.setRowCount(len(symbols))
-            self._symbol_to_row.clear()
-
-            for row, symbol in enumerate(symbols):
-                d = data_state[symbol]
-                base = symbol.replace("USDT", "")
-                name = POPULAR_NAMES.get(base, base)
-
-                # Nome
-                item = QTableWidgetItem(name)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 0, item)
-
-                # Símbolo
-                item = QTableWidgetItem(base)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 1, item)
-
-                # Preço
-                price = d.get("price", 0.0)
-                s = f"{price:,.4f}" if price < 10 else f"{price:,.2f}"
-                s = s.replace('.', '#').replace(',', '.').replace('#', ',')
-                item = QTableWidgetItem(s)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 2, item)
-
-                # Variação %
-                perc = d.get("price_change_percent", 0.0)
-                ps = f"{perc:.2f}%".replace('.', ',')
-                item = QTableWidgetItem(ps)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                item.setForeground(QBrush(QColor("#1fff53") if perc >= 0 else QColor("#ff3c3c")))
-                self.table.setItem(row, 3, item)
-
-                # Volume
-                vol = d.get("volume", 0.0)
-                item = QTableWidgetItem(format_volume(vol))
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 4, item)
-
-                # High
-                hv = d.get("high_price", 0.0)
-                s = f"{hv:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
-                item = QTableWidgetItem(s)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 5, item)
-
-                # Low
-                lv = d.get("low_price", 0.0)
-                s = f"{lv:,.2f}".replace('.', '#').replace(',', '.').replace('#', ',')
-                item = QTableWidgetItem(s)
-                item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.table.setItem(row, 6, item)
-
-                self._symbol_to_row[symbol] = row
-
-            self.table.setSortingEnabled(True)
-
+            self.model.update(data_state)
         except Exception as e:
             print("Erro update_table:", e)
 
@@ -284,33 +311,43 @@ class CryptoMonitorApp(QMainWindow):
     # ABRE JANELA DO GRÁFICO
     # ================================================================
     def open_graph(self):
-        row = self.table.currentRow()
-        if row < 0:
+        index = self.table.currentIndex()
+        if not index.isValid():
             QMessageBox.warning(self, "Erro", "Selecione uma criptomoeda.")
             return
 
-        symbol_item = self.table.item(row, 1)
-        if not symbol_item:
+        symbol = index.siblingAtColumn(1).data(SYMBOL_ROLE)
+        if not symbol:
             QMessageBox.warning(self, "Erro", "Erro ao obter símbolo.")
             return
 
-        symbol = symbol_item.text().upper() + "USDT"
+        # pyqtgraph só é carregado quando o primeiro gráfico abre
+        from ui.graph_window import GraphWindow
 
-        window = GraphWindow(symbol)
-        window.exec()
+        # não-modal: vários gráficos podem ficar abertos ao mesmo tempo
+        window = GraphWindow(self, symbol=symbol, loader=self.kline_loader, worker=self.worker)
+        window.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        window.show()
 
     # ================================================================
     # FECHAR PROGRAMA
     # ================================================================
     def closeEvent(self, event):
+        # o worker para primeiro: nenhum tick chega ao alert manager depois de fechado
+        try:
+            if self.worker:
+                self.worker.stop()
+        except:
+            pass
+
         try:
             self.alert_manager.save_alerts()
+            self.alert_manager.close()
         except:
             pass
 
         try:
-            if self.worker:
-                self.worker.stop()
+            self.kline_loader.shutdown()
         except:
             pass
 
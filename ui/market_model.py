@@ -0,0 +1,199 @@
+# ui/market_model.py
+from array import array
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PyQt6.QtGui import QColor, QBrush
+
+from core.utils import POPULAR_NAMES, format_volume
+from core.market_state import MarketRecord
+
+HEADERS = [
+    "Nome", "Símbolo", "Preço Atual (USDT)", "Variação % (24h)",
+    "Volume (24h)", "Preço Máx (24h)", "Preço Mín (24h)"
+]
+
+# campos do data_state guardados em colunas (uma array('d') por campo), na ordem das colunas 2..6
+FIELDS = ["price", "price_change_percent", "volume", "high_price", "low_price"]
+FIRST_NUMERIC_COL = 2
+
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+SYMBOL_ROLE = Qt.ItemDataRole.UserRole
+
+
+def _br(text):
+    # 1,234.56 -> 1.234,56
+    return text.replace('.', '#').replace(',', '.').replace('#', ',')
+
+
+def format_price(price):
+    return _br(f"{price:,.4f}" if price < 10 else f"{price:,.2f}")
+
+
+class MarketTableModel(QAbstractTableModel):
+    """Estado de mercado em colunas; o texto de cada célula só é formatado quando a view pede."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._symbols = []
+        self._bases = []
+        self._names = []
+        self._index = {}
+        self._name_for = self._popular_name
+        self._tooltip_for = None
+        self._columns = [array('d') for _ in FIELDS]
+        self._brush_up = QBrush(QColor("#1fff53"))
+        self._brush_down = QBrush(QColor("#ff3c3c"))
+
+    @staticmethod
+    def _popular_name(symbol):
+        base = symbol[:-4] if symbol.endswith("USDT") else symbol
+        return POPULAR_NAMES.get(base, base)
+
+    def set_name_resolver(self, name_for):
+        # ex: SymbolDirectory.display_name (exchangeInfo + POPULAR_NAMES)
+        self._name_for = name_for
+
+    def set_tooltip_provider(self, tooltip_for):
+        # tooltip_for(symbol) -> texto (ex: indicadores do símbolo); chamado só quando a view pede
+        self._tooltip_for = tooltip_for
+
+    # ----------------------------------------------------
+    # Atualização
+    # ----------------------------------------------------
+
+    def update(self, data_state):
+        new_symbols = sorted(s for s in data_state if s not in self._index)
+        if new_symbols:
+            first = len(self._symbols)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_symbols) - 1)
+            for symbol in new_symbols:
+                base = symbol[:-4] if symbol.endswith("USDT") else symbol
+                self._index[symbol] = len(self._symbols)
+                self._symbols.append(symbol)
+                self._bases.append(base)
+                self._names.append(self._name_for(symbol))
+                for col in self._columns:
+                    col.append(0.0)
+            self.endInsertRows()
+
+        changed = []
+        columns = self._columns
+        for symbol, d in data_state.items():
+            row = self._index[symbol]
+            if isinstance(d, MarketRecord):
+                values = d.as_row()
+            else:
+                values = [d.get(field) for field in FIELDS]
+            dirty = False
+            for col, value in zip(columns, values):
+                if value is not None and col[row] != value:
+                    col[row] = value
+                    dirty = True
+            if dirty:
+                changed.append(row)
+
+        # um dataChanged por faixa contígua de linhas alteradas
+        if changed:
+            changed.sort()
+            last_col = FIRST_NUMERIC_COL + len(FIELDS) - 1
+            start = prev = changed[0]
+            for row in changed[1:] + [None]:
+                if row is not None and row == prev + 1:
+                    prev = row
+                    continue
+                self.dataChanged.emit(
+                    self.index(start, FIRST_NUMERIC_COL), self.index(prev, last_col)
+                )
+                if row is not None:
+                    start = prev = row
+
+    def symbol_at(self, row):
+        if 0 <= row < len(self._symbols):
+            return self._symbols[row]
+        return None
+
+    def symbols(self):
+        return list(self._symbols)
+
+    def value(self, symbol, field):
+        row = self._index.get(symbol)
+        if row is None:
+            return None
+        return self._columns[FIELDS.index(field)][row]
+
+    # ----------------------------------------------------
+    # Interface QAbstractTableModel
+    # ----------------------------------------------------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._symbols)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                return self._names[row]
+            if col == 1:
+                return self._bases[row]
+            value = self._columns[col - FIRST_NUMERIC_COL][row]
+            if col == 2:
+                return format_price(value)
+            if col == 3:
+                return f"{value:.2f}%".replace('.', ',')
+            if col == 4:
+                return format_volume(value)
+            return _br(f"{value:,.2f}")
+
+        if role == SORT_ROLE:
+            if col == 0:
+                return self._names[row]
+            if col == 1:
+                return self._bases[row]
+            return self._columns[col - FIRST_NUMERIC_COL][row]
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+
+        if role == Qt.ItemDataRole.ForegroundRole and col == 3:
+            return self._brush_up if self._columns[1][row] >= 0 else self._brush_down
+
+        if role == SYMBOL_ROLE:
+            return self._symbols[row]
+
+        if role == Qt.ItemDataRole.ToolTipRole and self._tooltip_for is not None:
+            return self._tooltip_for(self._symbols[row])
+
+        return None
+
+
+class MarketFilterProxy(QSortFilterProxyModel):
+    """Ordenação numérica e filtro por nome/símbolo sobre o MarketTableModel."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def set_filter_text(self, text):
+        self._text = text.lower().strip()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._text:
+            return True
+        model = self.sourceModel()
+        name = model.index(source_row, 0, source_parent).data() or ""
+        base = model.index(source_row, 1, source_parent).data() or ""
+        return self._text in name.lower() or self._text in base.lower()
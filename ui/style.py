@@ -3,7 +3,7 @@ QMainWindow, QWidget {
     background-color: #1e1e1e;
     color: #ffffff;
 }
-QTableWidget {
+QTableWidget, QTableView {
     background-color: #2b2b2b;
     color: white;
     border: 1px solid #444;